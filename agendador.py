@@ -0,0 +1,97 @@
+import time
+
+# --- PASSO FIXO COM ACUMULADOR ---
+# O tempo real decorrido entre quadros entra num acumulador, e a simulação
+# avança em passos de exatamente 1/tick_rate s enquanto houver tempo
+# acumulado. Um quadro lento executa mais passos em vez de deixar o jogo
+# mais lento ou mais fácil; 'alpha' (fração do próximo passo já decorrida)
+# serve para interpolar as posições desenhadas entre dois passos.
+class FixedStepScheduler:
+    def __init__(self, tick_rate, max_steps=5):
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.max_steps = max_steps  # Evita a "espiral da morte" em travadas longas
+        self.accumulator = 0.0
+        self.last_time = None
+        self.dropped = 0.0  # Tempo descartado por excesso de passos (s)
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.last_time = None
+
+    def advance(self, now=None):
+        # Retorna quantos passos fixos executar neste quadro
+        now = time.perf_counter() if now is None else now
+        if self.last_time is None:
+            self.last_time = now - self.dt
+        self.accumulator += now - self.last_time
+        self.last_time = now
+
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            # Atraso grande demais (janela arrastada, disco lento): o jogo
+            # desacelera por um instante em vez de congelar tentando alcançar
+            self.dropped += (steps - self.max_steps) * self.dt
+            steps = self.max_steps
+            self.accumulator = steps * self.dt + self.accumulator % self.dt
+        self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self):
+        return min(1.0, self.accumulator / self.dt)
+
+
+# --- QUALIDADE ADAPTATIVA ---
+# Compara o tempo de trabalho de cada quadro (sem a espera do clock) com o
+# orçamento de um passo. Acima de 'high' do orçamento por 'degrade_after'
+# quadros seguidos, desce um nível; abaixo de 'low' por 'upgrade_after'
+# quadros, sobe um. A média móvel exponencial ignora picos isolados.
+QUALITY_LEVELS = (
+    {'name': "alta", 'particles': 1.0, 'animated_background': True, 'spectrometer': True},
+    {'name': "media", 'particles': 0.3, 'animated_background': True, 'spectrometer': True},
+    {'name': "baixa", 'particles': 0.3, 'animated_background': False, 'spectrometer': True},
+    {'name': "minima", 'particles': 0.0, 'animated_background': False, 'spectrometer': False},
+)
+
+class QualityGovernor:
+    def __init__(self, budget_ms, level=0, adaptive=True, high=0.9, low=0.5,
+                 degrade_after=30, upgrade_after=300, smoothing=0.1):
+        self.budget_ms = budget_ms
+        self.level = level
+        self.adaptive = adaptive
+        self.high = high
+        self.low = low
+        self.degrade_after = degrade_after
+        self.upgrade_after = upgrade_after
+        self.smoothing = smoothing
+        self.average_ms = 0.0
+        self.over = 0
+        self.under = 0
+
+    @property
+    def settings(self):
+        return QUALITY_LEVELS[self.level]
+
+    def observe(self, work_ms):
+        # Registra o tempo de trabalho do quadro; retorna o nível atual
+        self.average_ms += (work_ms - self.average_ms) * self.smoothing
+        if not self.adaptive:
+            return self.level
+
+        if self.average_ms > self.budget_ms * self.high:
+            self.over += 1
+            self.under = 0
+        elif self.average_ms < self.budget_ms * self.low:
+            self.under += 1
+            self.over = 0
+        else:
+            self.over = self.under = 0
+
+        if self.over >= self.degrade_after and self.level < len(QUALITY_LEVELS) - 1:
+            self.level += 1
+            self.over = 0
+        elif self.under >= self.upgrade_after and self.level > 0:
+            self.level -= 1
+            self.under = 0
+        return self.level
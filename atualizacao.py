@@ -0,0 +1,100 @@
+import pygame
+
+# --- ATUALIZAÇÃO POR RETÂNGULOS SUJOS ---
+# A cena continua sendo desenhada por inteiro na superfície da tela, mas só
+# as regiões que mudaram são enviadas à janela com
+# pygame.display.update(rects). Cada elemento (pássaro, canos, partículas,
+# placar...) informa a área onde foi desenhado; a área suja do quadro é a
+# posição atual somada à do quadro anterior (para apagar o rastro). Se a
+# soma passar de 'max_fraction' da tela, um flip completo sai mais barato.
+# Retângulos sólidos que só deslizam na horizontal (os canos) usam
+# mark_solid(): basta atualizar as faixas das bordas que se moveram.
+# Com enabled=False, todo quadro é um flip completo (comportamento antigo).
+class DirtyRectTracker:
+    def __init__(self, width, height, max_fraction=0.5, enabled=True):
+        self.enabled = enabled
+        self.screen_rect = pygame.Rect(0, 0, width, height)
+        self.screen_area = width * height
+        self.max_fraction = max_fraction
+        self.previous = {}
+        self.current = {}
+        self.previous_solid = {}
+        self.current_solid = {}
+        self.full = True  # O primeiro quadro sempre é completo
+        self.updated_area = 0
+        self.frames = 0
+        self.full_frames = 0
+
+    def mark(self, key, rects):
+        # Registra a(s) área(s) desenhada(s) pelo elemento 'key' neste quadro
+        if rects is None:
+            return
+        if isinstance(rects, pygame.Rect):
+            rects = [rects]
+        self.current.setdefault(key, []).extend(rects)
+
+    def mark_solid(self, key, rect):
+        # Retângulo de cor sólida identificado por 'key' (estável entre quadros)
+        self.current_solid[key] = rect
+
+    def invalidate(self):
+        # Próximo quadro inteiro (troca de tela, painel ligado/desligado...)
+        self.full = True
+
+    def dirty_rects(self):
+        rects = []
+        for key in self.current.keys() | self.previous.keys():
+            rects.extend(self.current.get(key, ()))
+            rects.extend(self.previous.get(key, ()))
+        for key in self.current_solid.keys() | self.previous_solid.keys():
+            rect = self.current_solid.get(key)
+            old = self.previous_solid.get(key)
+            if rect is None or old is None or (rect.y, rect.h) != (old.y, old.h):
+                rects.extend(r for r in (rect, old) if r is not None)
+            elif rect.x != old.x:
+                # Só as bordas esquerda e direita mudam de cor
+                left, right = sorted((rect.x, old.x)), sorted((rect.right, old.right))
+                rects.append(pygame.Rect(left[0], rect.y, left[1] - left[0], rect.h))
+                rects.append(pygame.Rect(right[0], rect.y, right[1] - right[0], rect.h))
+        # Juntar retângulos sobrepostos quando a união não cobre mais área
+        # que os dois separados (unir uma faixa fina a uma nuvem criaria um
+        # retângulo grande com pixels que não mudaram)
+        merged = []
+        for rect in rects:
+            rect = rect.clip(self.screen_rect)
+            if not rect:
+                continue
+            joined = True
+            while joined:
+                joined = False
+                for i in rect.collidelistall(merged):
+                    other = merged[i]
+                    union = rect.union(other)
+                    if union.w * union.h <= rect.w * rect.h + other.w * other.h:
+                        del merged[i]
+                        rect = union
+                        joined = True
+                        break
+            merged.append(rect)
+        return merged
+
+    def present(self):
+        # Envia o quadro à janela; retorna a fração da tela atualizada
+        full = self.full or not self.enabled
+        rects = [] if full else self.dirty_rects()
+        area = sum(rect.w * rect.h for rect in rects)
+        if full or area > self.screen_area * self.max_fraction:
+            pygame.display.flip()
+            area = self.screen_area
+            self.full_frames += 1
+        elif rects:
+            pygame.display.update(rects)
+
+        self.previous, self.current = self.current, self.previous
+        self.current.clear()
+        self.previous_solid, self.current_solid = self.current_solid, self.previous_solid
+        self.current_solid.clear()
+        self.full = False
+        self.frames += 1
+        self.updated_area = area
+        return area / self.screen_area
@@ -0,0 +1,434 @@
+import numpy as np
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+import time
+from espectro import BandMapper
+from tom import PitchEstimator
+from filtros import NoiseProfile, voice_bandpass
+
+# --- BUFFER CIRCULAR DE ÁUDIO ---
+# Capacidade fixa e pré-alocada: o callback do microfone escreve os blocos
+# aqui e a análise lê sempre as amostras mais recentes, sem realocar memória.
+# Há um único escritor (callback) e um único leitor (análise), então não é
+# preciso trava: a posição só é publicada depois que os dados foram copiados.
+class RingBuffer:
+    def __init__(self, capacity, channels=1, buffer=None):
+        self.capacity = capacity
+        self.channels = channels
+        if buffer is None:
+            buffer = bytearray(RingBuffer.nbytes(capacity, channels))
+        # Contador e horário da última escrita ficam no mesmo bloco de memória
+        # que as amostras, para que o buffer possa viver em memória compartilhada
+        self._state = np.ndarray(1, dtype=np.int64, buffer=buffer)
+        self._stamp = np.ndarray(1, dtype=np.float64, buffer=buffer, offset=8)
+        self.data = np.ndarray((capacity, channels), dtype=np.float32, buffer=buffer, offset=16)
+
+    @staticmethod
+    def nbytes(capacity, channels=1):
+        return 16 + capacity * channels * 4
+
+    # Total de amostras já escritas (posição absoluta no fluxo)
+    @property
+    def written(self):
+        return int(self._state[0])
+
+    @written.setter
+    def written(self, value):
+        self._state[0] = value
+
+    # Horário (time.perf_counter) em que a última amostra foi capturada
+    @property
+    def timestamp(self):
+        return float(self._stamp[0])
+
+    def write(self, block, timestamp=None):
+        block = block.reshape(len(block), -1)
+        n = len(block)
+        if n >= self.capacity:
+            # Bloco maior que o buffer: só as amostras finais importam
+            block = block[-self.capacity:]
+            self.written += n - self.capacity
+            n = self.capacity
+
+        start = self.written % self.capacity
+        end = start + n
+        if end <= self.capacity:
+            self.data[start:end] = block
+        else:
+            first = self.capacity - start
+            self.data[start:] = block[:first]
+            self.data[:end - self.capacity] = block[first:]
+        # Só publicar a nova posição depois que os dados foram copiados
+        self._stamp[0] = time.perf_counter() if timestamp is None else timestamp
+        self.written += n
+
+    def read_latest(self, out):
+        # Copia as len(out) amostras mais recentes para 'out' (sem alocar)
+        n = len(out)
+        end = self.written % self.capacity
+        start = end - n
+        if start >= 0:
+            out[:] = self.data[start:end]
+        else:
+            out[:-start] = self.data[start:]
+            out[-start:] = self.data[:end]
+        return out
+
+
+# --- ANÁLISE COM JANELA DESLIZANTE ---
+# A cada 'hop_size' novas amostras, analisa a janela de 'window_size'
+# amostras mais recentes. Os últimos valores ficam guardados entre os
+# quadros, então o RMS não volta a zero quando nenhum bloco novo chegou.
+# Com vários canais (um microfone por jogador), RMS, pico, FFT e limiar de
+# ruído de todos saem da mesma passada sobre o bloco (amostras, canais); os
+# campos escalares (rms, gate...) e o espectro exibido são os do canal 0.
+class AudioAnalyzer:
+    def __init__(self, window_size=4096, hop_size=1024, channels=1, sample_rate=44100,
+                 band_config=None, pitch_config=None, noise_config=None):
+        self.window_size = window_size
+        self.hop_size = hop_size
+        self.channels = channels
+        self.sample_rate = sample_rate
+        # Bandas log/mel opcionais (ver espectro.BandMapper)
+        self.bands = None
+        if band_config:
+            self.bands = BandMapper(window_size // 2 + 1, sample_rate, **band_config)
+        self.band_values = np.zeros(self.bands.n_bands if self.bands else 0, dtype=np.float32)
+        # Estimativa de tom opcional (ver tom.PitchEstimator)
+        self.pitch = None
+        if pitch_config:
+            self.pitch = PitchEstimator(window_size, sample_rate, **pitch_config)
+            self.power = np.zeros((window_size + 1, channels))
+        # Perfil de ruído, limiar adaptativo e subtração espectral opcionais
+        # (ver filtros.NoiseProfile)
+        self.noise = None
+        if noise_config:
+            self.noise = NoiseProfile(window_size // 2 + 1, channels, **noise_config)
+        self.window = np.zeros((window_size, channels), dtype=np.float32)
+        # Quadrados com um canal por linha: as reduções por canal (média,
+        # máximo) ficam contíguas em vez de percorrer colunas
+        self.squares = np.zeros((channels, window_size), dtype=np.float32)
+        self.mean_weights = np.full(window_size, 1 / window_size, dtype=np.float32)
+        self.reduced = np.zeros(channels, dtype=np.float32)
+        self.magnitude = np.zeros((window_size // 2 + 1, channels), dtype=np.float32)
+        self.spectrum = np.zeros(window_size // 2 + 1, dtype=np.float32)
+        # Uma linha por campo de CHANNEL_FIELDS, uma coluna por canal
+        self.channel_values = np.zeros((len(CHANNEL_FIELDS), channels))
+        (self.channel_rms, self.channel_peak, self.channel_pitch_hz, self.channel_pitch_confidence,
+         self.channel_noise_rms, self.channel_gate) = self.channel_values
+        self.rms = 0.0
+        self.peak = 0.0
+        self.dominant_hz = 0.0
+        self.pitch_hz = 0.0
+        self.pitch_confidence = 0.0
+        self.noise_rms = 0.0
+        self.gate = 0.0
+        self.calibrating = 0
+        self.capture_time = 0.0
+        self.analysis_time = 0.0
+        self.last_analyzed = 0
+
+    def update(self, ring):
+        # Ainda não há amostras novas suficientes para mais um salto
+        if ring.written - self.last_analyzed < self.hop_size:
+            return False
+        if ring.written < self.window_size:
+            return False
+
+        self.last_analyzed = ring.written
+        self.capture_time = ring.timestamp
+        start = time.perf_counter()
+        ring.read_latest(self.window)
+        self.analyze(self.window)
+        self.analysis_time = time.perf_counter() - start
+        return True
+
+    def analyze(self, block):
+        # RMS (intensidade da voz) e pico de todos os canais
+        np.square(block.T, out=self.squares)
+        np.matmul(self.squares, self.mean_weights, out=self.reduced)
+        np.sqrt(self.reduced, out=self.channel_rms)
+        np.max(self.squares, axis=1, out=self.reduced)
+        np.sqrt(self.reduced, out=self.channel_peak)
+
+        # FFT para visualização, na mesma escala logarítmica de antes
+        if self.pitch is None:
+            np.abs(np.fft.rfft(block, axis=0), out=self.magnitude)
+        else:
+            # Uma única FFT em 2N pontos serve aos dois: os bins pares são
+            # exatamente os da FFT em N pontos, e |X|² dá a autocorrelação
+            spectrum = np.fft.rfft(block, n=2 * self.window_size, axis=0)
+            np.abs(spectrum[::2], out=self.magnitude)
+            np.abs(spectrum, out=self.power)
+            np.square(self.power, out=self.power)
+            # A busca do período (YIN) é feita canal a canal
+            for channel in range(self.channels):
+                (self.channel_pitch_hz[channel],
+                 self.channel_pitch_confidence[channel]) = self.pitch.estimate(
+                    self.power[:, channel], self.squares[channel])
+        if self.noise is not None:
+            self.noise.update(self.channel_rms, self.magnitude)
+            self.noise.apply(self.magnitude)
+            self.channel_noise_rms[:] = self.noise.noise_rms
+            self.channel_gate[:] = self.noise.gate
+            self.calibrating = self.noise.calibrating
+        (self.rms, self.peak, self.pitch_hz, self.pitch_confidence, self.noise_rms,
+         self.gate) = self.channel_values[:, 0].tolist()
+        np.add(self.magnitude[:, 0], 1, out=self.spectrum)
+        np.log10(self.spectrum, out=self.spectrum)
+        self.spectrum *= 10
+        np.clip(self.spectrum, 0, 50, out=self.spectrum)
+        if self.bands is not None:
+            self.bands.apply(self.magnitude[:, 0], out=self.band_values)
+            self.band_values += 1
+            np.log10(self.band_values, out=self.band_values)
+            self.band_values *= 10
+            np.clip(self.band_values, 0, 50, out=self.band_values)
+        # Frequência dominante (ignorando a componente contínua)
+        self.dominant_hz = float(np.argmax(self.magnitude[1:, 0]) + 1) * self.sample_rate / self.window_size
+
+
+# --- QUADRO DE CARACTERÍSTICAS ---
+# Resultado de uma análise, com os horários para o jogo saber o quão
+# "velho" está o dado. Todos os horários usam time.perf_counter, que é
+# monotônico e comum a todos os processos da máquina.
+FEATURE_FIELDS = ("timestamp", "capture_time", "rms", "peak", "dominant_hz", "count",
+                  "analysis_time", "pitch_hz", "pitch_confidence", "noise_rms", "gate",
+                  "calibrating")
+# Campos com um valor por canal (jogador)
+CHANNEL_FIELDS = ("rms", "peak", "pitch_hz", "pitch_confidence", "noise_rms", "gate")
+
+class FeatureFrame:
+    def __init__(self, n_bins, n_bands=0, channels=1):
+        self.timestamp = 0.0  # Quando a análise foi publicada
+        self.capture_time = 0.0  # Quando a amostra mais recente da janela foi capturada
+        self.rms = 0.0
+        self.peak = 0.0
+        self.dominant_hz = 0.0
+        self.count = 0  # Número de análises publicadas até agora
+        self.analysis_time = 0.0  # Duração da análise no trabalhador (s)
+        self.pitch_hz = 0.0  # Frequência fundamental estimada (0 sem estimativa)
+        self.pitch_confidence = 0.0  # 0 a 1; abaixo do limiar o tom é ignorado
+        self.noise_rms = 0.0  # RMS estimado do ruído de fundo
+        self.gate = 0.0  # Limiar adaptativo de voz (0 sem perfil de ruído)
+        self.calibrating = 0  # Análises restantes da calibração em andamento
+        self.spectrum = np.zeros(n_bins, dtype=np.float32)
+        self.bands = np.zeros(n_bands, dtype=np.float32)  # Mesma escala do espectro
+        # Valores de cada canal (linhas em CHANNEL_FIELDS); rms, gate etc.
+        # acima são os do canal 0
+        self.channel_values = np.zeros((len(CHANNEL_FIELDS), channels))
+        (self.channel_rms, self.channel_peak, self.channel_pitch_hz, self.channel_pitch_confidence,
+         self.channel_noise_rms, self.channel_gate) = self.channel_values
+
+    def age(self, now=None):
+        if self.count == 0:
+            return float('inf')
+        return (time.perf_counter() if now is None else now) - self.capture_time
+
+
+# --- SLOT DE PUBLICAÇÃO SEM TRAVA (SEQLOCK) ---
+# O trabalhador DSP escreve o quadro mais recente e o jogo só lê. Um número
+# de sequência ímpar indica escrita em andamento; o leitor tenta de novo se
+# a sequência mudou durante a cópia. Funciona tanto com memória comum
+# quanto com memória compartilhada entre processos. No sentido contrário, o
+# jogo pede calibrações por 'control' (contador de pedidos, análises), que
+# só ele escreve.
+class FeatureSlot:
+    def __init__(self, n_bins, n_bands=0, channels=1, buffer=None):
+        self.n_bins = n_bins
+        self.n_bands = n_bands
+        self.channels = channels
+        if buffer is None:
+            buffer = bytearray(FeatureSlot.nbytes(n_bins, n_bands, channels))
+        header = 24 + 8 * len(FEATURE_FIELDS)
+        offset = header + 8 * len(CHANNEL_FIELDS) * channels
+        self.seq = np.ndarray(1, dtype=np.int64, buffer=buffer)
+        self.control = np.ndarray(2, dtype=np.int64, buffer=buffer, offset=8)
+        self.values = np.ndarray(len(FEATURE_FIELDS), dtype=np.float64, buffer=buffer, offset=24)
+        self.channel_values = np.ndarray((len(CHANNEL_FIELDS), channels), dtype=np.float64,
+                                         buffer=buffer, offset=header)
+        self.spectrum = np.ndarray(n_bins, dtype=np.float32, buffer=buffer, offset=offset)
+        self.bands = np.ndarray(n_bands, dtype=np.float32, buffer=buffer, offset=offset + 4 * n_bins)
+
+    @staticmethod
+    def nbytes(n_bins, n_bands=0, channels=1):
+        return (24 + 8 * len(FEATURE_FIELDS) + 8 * len(CHANNEL_FIELDS) * channels
+                + 4 * (n_bins + n_bands))
+
+    def publish(self, analyzer):
+        self.seq[0] += 1
+        count = self.values[5] + 1
+        self.values[:] = (time.perf_counter(), analyzer.capture_time, analyzer.rms,
+                          analyzer.peak, analyzer.dominant_hz, count, analyzer.analysis_time,
+                          analyzer.pitch_hz, analyzer.pitch_confidence, analyzer.noise_rms,
+                          analyzer.gate, analyzer.calibrating)
+        self.channel_values[:] = analyzer.channel_values
+        self.spectrum[:] = analyzer.spectrum
+        self.bands[:] = analyzer.band_values
+        self.seq[0] += 1
+
+    def read(self, frame):
+        # Retorna False se não houver quadro novo desde a última leitura
+        while True:
+            seq = int(self.seq[0])
+            if seq & 1:
+                continue
+            count = int(self.values[5])
+            if count == frame.count:
+                return False
+            values = self.values.copy()
+            frame.channel_values[:] = self.channel_values
+            frame.spectrum[:] = self.spectrum
+            frame.bands[:] = self.bands
+            if int(self.seq[0]) == seq:
+                break
+        (frame.timestamp, frame.capture_time, frame.rms, frame.peak, frame.dominant_hz, _,
+         frame.analysis_time, frame.pitch_hz, frame.pitch_confidence, frame.noise_rms, frame.gate,
+         calibrating) = values
+        frame.count = count
+        frame.calibrating = int(calibrating)
+        return True
+
+
+def _analysis_loop(ring, slot, analyzer, stop, wake, poll_interval):
+    calibration_requests = 0
+    while not stop.is_set():
+        if int(slot.control[0]) != calibration_requests:
+            calibration_requests = int(slot.control[0])
+            if analyzer.noise is not None:
+                analyzer.noise.start_calibration(int(slot.control[1]))
+        if analyzer.update(ring):
+            slot.publish(analyzer)
+        elif wake is not None:
+            wake.wait(poll_interval)
+            wake.clear()
+        else:
+            time.sleep(poll_interval)
+
+
+def _process_worker(ring_name, slot_name, capacity, channels, window_size, hop_size,
+                    sample_rate, band_config, pitch_config, noise_config, stop, poll_interval):
+    ring_shm = shared_memory.SharedMemory(name=ring_name)
+    slot_shm = shared_memory.SharedMemory(name=slot_name)
+    try:
+        ring = RingBuffer(capacity, channels, buffer=ring_shm.buf)
+        analyzer = AudioAnalyzer(window_size, hop_size, channels, sample_rate, band_config,
+                                 pitch_config, noise_config)
+        slot = FeatureSlot(window_size // 2 + 1, len(analyzer.band_values), channels,
+                           buffer=slot_shm.buf)
+        _analysis_loop(ring, slot, analyzer, stop, None, poll_interval)
+        del ring, slot
+    finally:
+        ring_shm.close()
+        slot_shm.close()
+
+
+# --- TRABALHADOR DSP ---
+# Tira o RMS, a FFT e o tom da thread de renderização. O callback de áudio chama
+# push() com cada bloco; o trabalhador (thread ou processo) analisa e
+# publica no FeatureSlot, e o loop do jogo apenas chama latest(). Com
+# filter_config, cada bloco passa antes por um passa-faixa de voz com estado
+# mantido entre blocos (ver filtros.BlockIIR).
+class DSPWorker:
+    def __init__(self, mode="thread", window_size=4096, hop_size=1024, capacity=44100,
+                 channels=1, sample_rate=44100, band_config=None, pitch_config=None,
+                 noise_config=None, filter_config=None):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Modo de DSP desconhecido: {mode}")
+        self.mode = mode
+        self.window_size = window_size
+        self.hop_size = hop_size
+        self.capacity = capacity
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.band_config = band_config
+        self.pitch_config = pitch_config
+        self.noise_config = noise_config
+        self.filter = None
+        if filter_config:
+            self.filter = voice_bandpass(sample_rate, channels=channels, **filter_config)
+        # Metade do intervalo entre análises
+        self.poll_interval = hop_size / sample_rate / 2
+        n_bins = window_size // 2 + 1
+        n_bands = band_config['n_bands'] if band_config else 0
+        self.frame = FeatureFrame(n_bins, n_bands, channels)
+        self._shared = []
+        self._worker = None
+
+        if mode == "process":
+            ring_shm = shared_memory.SharedMemory(create=True, size=RingBuffer.nbytes(capacity, channels))
+            slot_shm = shared_memory.SharedMemory(create=True,
+                                                  size=FeatureSlot.nbytes(n_bins, n_bands, channels))
+            self._shared = [ring_shm, slot_shm]
+            self.ring = RingBuffer(capacity, channels, buffer=ring_shm.buf)
+            self.slot = FeatureSlot(n_bins, n_bands, channels, buffer=slot_shm.buf)
+            self.ring.written = 0
+            self.slot.seq[0] = 0
+            self.slot.control[:] = 0
+            self.slot.values[:] = 0
+            self.slot.channel_values[:] = 0
+            self._stop = multiprocessing.Event()
+            self._wake = None
+        else:
+            self.ring = RingBuffer(capacity, channels)
+            self.slot = FeatureSlot(n_bins, n_bands, channels)
+            self.analyzer = AudioAnalyzer(window_size, hop_size, channels, sample_rate, band_config,
+                                          pitch_config, noise_config)
+            self._stop = threading.Event()
+            self._wake = threading.Event()
+
+    def push(self, block, timestamp=None):
+        # timestamp: instante de captura da última amostra (padrão: agora)
+        if self.filter is None:
+            self.ring.write(block, timestamp)
+        else:
+            block = block.reshape(len(block), -1)
+            step = self.filter.max_block
+            for start in range(0, len(block), step):
+                self.ring.write(self.filter.process(block[start:start + step]), timestamp)
+        if self._wake is not None:
+            self._wake.set()
+
+    def start(self):
+        if self.mode == "process":
+            # No modo 'spawn' (Windows/macOS) o processo filho reimporta o
+            # script principal, que precisa estar protegido por __main__
+            self._worker = multiprocessing.Process(
+                target=_process_worker,
+                args=(self._shared[0].name, self._shared[1].name, self.capacity, self.channels,
+                      self.window_size, self.hop_size, self.sample_rate, self.band_config,
+                      self.pitch_config, self.noise_config, self._stop, self.poll_interval),
+                daemon=True)
+        else:
+            self._worker = threading.Thread(
+                target=_analysis_loop,
+                args=(self.ring, self.slot, self.analyzer, self._stop, self._wake,
+                      self.poll_interval),
+                daemon=True)
+        self._worker.start()
+
+    def calibrate(self, seconds):
+        # Pede ao trabalhador uma nova medição do ruído de fundo
+        self.slot.control[1] = max(1, round(seconds * self.sample_rate / self.hop_size))
+        self.slot.control[0] += 1
+
+    def latest(self):
+        # Leitura barata para o loop do jogo: copia o último quadro publicado
+        self.slot.read(self.frame)
+        return self.frame
+
+    def stop(self):
+        self._stop.set()
+        if self._wake is not None:
+            self._wake.set()
+        if self._worker is not None:
+            self._worker.join(timeout=1.0)
+            self._worker = None
+        if self._shared:
+            # As visões numpy precisam ser liberadas antes de fechar a memória
+            self.ring = self.slot = None
+            for shm in self._shared:
+                shm.close()
+                shm.unlink()
+            self._shared = []
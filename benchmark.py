@@ -0,0 +1,283 @@
+import os
+# Sem janela: o SDL usa o driver de vídeo "dummy" (precisa vir antes do pygame)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import numpy as np
+import pygame
+
+from audio import RingBuffer, AudioAnalyzer
+from filtros import voice_bandpass
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, TICK_RATE
+from particulas import ParticleSystem
+from cenario import StarField, CloudLayer, BackgroundRenderer
+from simulacao import GameSimulation, synthetic_features
+
+# --- BENCHMARKS DOS CAMINHOS CRÍTICOS ---
+# Mede DSP, simulação e renderização sem microfone nem janela, com áudio
+# sintético. O resultado vai para um JSON que pode ser comparado com o de
+# outra versão (--comparar) para achar regressões no custo por quadro.
+
+def measure(func, iterations, repeats=5, setup=None):
+    # Roda 'func' 'iterations' vezes em 'repeats' rodadas e devolve o tempo
+    # por chamada (µs) de cada rodada
+    samples = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        samples.append((time.perf_counter() - start) / iterations * 1e6)
+    return samples
+
+
+def summarize(samples, iterations, **extra):
+    result = {
+        'median_us': statistics.median(samples),
+        'min_us': min(samples),
+        'mean_us': statistics.fmean(samples),
+        'stdev_us': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'iterations': iterations,
+        'repeats': len(samples),
+    }
+    result.update(extra)
+    return result
+
+
+def synthetic_audio(seconds, sample_rate=44100, seed=0):
+    # Voz aproximada: harmônicos de 220 Hz com envelope e um pouco de ruído
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    voice = sum(np.sin(2 * np.pi * 220 * k * t) / k for k in range(1, 6))
+    envelope = (np.sin(2 * np.pi * 0.5 * t) > 0) * 0.1
+    signal = voice * envelope + rng.standard_normal(len(t)) * 0.005
+    return signal.astype(np.float32)[:, None]
+
+
+def bench_audio(results, quick):
+    audio = synthetic_audio(2)
+    block_size, window, hop = 512, 4096, 512
+
+    # Acúmulo no buffer circular + análise por salto (caminho do callback/DSP)
+    ring = RingBuffer(44100)
+    analyzer = AudioAnalyzer(window, hop)
+    blocks = [audio[i:i + block_size] for i in range(0, len(audio) - block_size, block_size)]
+    state = {'i': 0}
+
+    def accumulate_and_analyze():
+        ring.write(blocks[state['i'] % len(blocks)])
+        analyzer.update(ring)
+        state['i'] += 1
+
+    n = 200 if quick else 1000
+    results['audio/acumular+analisar'] = summarize(measure(accumulate_and_analyze, n), n,
+                                                    block_size=block_size)
+
+    # Passa-faixa de voz com estado, aplicado a cada bloco no push()
+    bandpass = voice_bandpass(44100)
+    block = blocks[0]
+    results['audio/passa-faixa'] = summarize(measure(lambda: bandpass.process(block), n), n,
+                                             block_size=block_size)
+
+    # RMS + FFT por tamanho de janela
+    for size in (512, 1024, 2048, 4096, 8192):
+        analyzer = AudioAnalyzer(size, size)
+        block = audio[:size]
+        n = 100 if quick else 500
+        samples = measure(lambda: analyzer.analyze(block), n)
+        median = statistics.median(samples)
+        results[f'audio/rms+fft/{size}'] = summarize(samples, n, window=size,
+                                                      samples_per_s=size / median * 1e6)
+
+    # Multijogador: RMS, FFT e limiar de todos os canais numa única análise
+    for channels in (1, 2, 4, 8):
+        analyzer = AudioAnalyzer(window, hop, channels, noise_config={'margin': 2.0})
+        block = np.repeat(audio[:window].reshape(window, -1)[:, :1], channels, axis=1)
+        n = 100 if quick else 500
+        results[f'audio/canais/{channels}'] = summarize(
+            measure(lambda: analyzer.analyze(block), n), n, channels=channels)
+
+
+def bench_particles(results, screen, quick):
+    for count in (100, 1000, 10000):
+        system = ParticleSystem(capacity=count, seed=0)
+
+        def fill():
+            system.count = 0
+            system.emit(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, (120, 255, 140), count // 2)
+            system.emit(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, (255, 200, 0, 255), count - count // 2)
+            # Vidas variadas para exercitar todas as faixas de alfa
+            system.state[4, :count] = system.rng.integers(1, system.lifetime + 1, count)
+
+        n = 10 if quick or count == 10000 else 50
+        results[f'particulas/update/{count}'] = summarize(
+            measure(system.update, 1, repeats=n, setup=fill), 1, particles=count)
+        fill()
+        results[f'particulas/draw/{count}'] = summarize(
+            measure(lambda: system.draw(screen), n), n, particles=count)
+
+
+def bench_scenery(results, screen, quick):
+    n = 50 if quick else 300
+    for count in (50, 1000, 10000):
+        starfield = StarField(count, SCREEN_WIDTH, SCREEN_HEIGHT - 100, seed=0)
+        layers = [CloudLayer(2, SCREEN_WIDTH, 50, SCREEN_HEIGHT // 3, speed, scale, alpha, seed=i)
+                  for i, (speed, scale, alpha) in enumerate(((0.15, 0.6, 60), (0.3, 0.8, 80), (0.5, 1.0, 100)))]
+        background = BackgroundRenderer(SCREEN_WIDTH, SCREEN_HEIGHT, (20, 24, 82), (34, 139, 34),
+                                        starfield, layers, star_refresh=1)
+        background.draw(screen)
+
+        def frame():
+            background.update()
+            background.draw(screen)
+
+        results[f'cenario/quadro/{count}'] = summarize(measure(frame, n), n, stars=count)
+
+
+def bench_render(results, screen, quick):
+    import jogo
+
+    n = 50 if quick else 300
+    results['render/draw_background'] = summarize(measure(lambda: jogo.draw_background(screen), n), n)
+
+    bird = jogo.create_birds(1)[0]
+    state = {'vy': -5.0}
+
+    def bird_draw():
+        # Varre toda a faixa de ângulos
+        state['vy'] = state['vy'] + 0.1 if state['vy'] < 5 else -5.0
+        bird.update(state['vy'])
+        bird.draw(screen)
+
+    results['render/bird.draw'] = summarize(measure(bird_draw, n * 4), n * 4)
+
+    # Quadro completo da partida: simulação, partículas e todos os desenhos
+    sim = GameSimulation(seed=0)
+    bird.rect = sim.bird_rect
+    features = synthetic_features(seed=0)
+    band_data = np.abs(np.random.default_rng(0).normal(20, 10, jogo.BAND_CONFIG['n_bands'])).astype(np.float32)
+    particles = jogo.particle_system
+
+    def full_frame():
+        if not sim.alive:
+            sim.reset(0)
+            bird.rect = sim.bird_rect
+        events = sim.step(next(features))
+        bird.update(sim.vy)
+        if "lift" in events:
+            particles.emit(bird.rect.centerx - 10, bird.rect.centery + 10, (*jogo.PLAYER_COLOR, 255), 3)
+        particles.update()
+        jogo.background.update()
+        jogo.draw_background(screen)
+        for _, top, bottom in sim.obstacles.rects():
+            jogo.draw_obstacle(screen, top)
+            jogo.draw_obstacle(screen, bottom)
+        bird.draw(screen)
+        particles.draw(screen)
+        jogo.draw_score(screen, sim.score)
+        jogo.draw_spectrometer(screen, band_data)
+
+    results['render/quadro completo'] = summarize(measure(full_frame, n), n,
+                                                   budget_us=1e6 / TICK_RATE)
+
+
+def bench_simulation(results, quick):
+    sessions = 20 if quick else 100
+
+    def run_sessions():
+        for seed in range(sessions):
+            GameSimulation(seed).run(synthetic_features(seed), max_ticks=TICK_RATE * 60)
+
+    samples = measure(run_sessions, 1, repeats=3)
+    results['simulacao/partidas'] = summarize(samples, 1, sessions=sessions)
+
+
+def metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        'commit': commit,
+        'date': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pygame': pygame.version.ver,
+        'platform': platform.platform(),
+    }
+
+
+def compare(current, baseline, threshold):
+    # Mostra a variação da mediana de cada benchmark; retorna as regressões
+    regressions = []
+    print(f"{'benchmark':<32}{'base (µs)':>12}{'atual (µs)':>12}{'variação':>10}")
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            print(f"{name:<32}{'-':>12}{result['median_us']:12.1f}{'novo':>10}")
+            continue
+        change = result['median_us'] / base['median_us'] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  << regressão"
+            regressions.append(name)
+        print(f"{name:<32}{base['median_us']:12.1f}{result['median_us']:12.1f}{change:+10.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do Flappy Voice (sem janela)")
+    parser.add_argument("--saida", default="benchmark.json", help="Arquivo JSON com os resultados")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--limite", type=float, default=0.10,
+                        help="Piora relativa da mediana considerada regressão (padrão 10%%)")
+    parser.add_argument("--rapido", action="store_true", help="Menos iterações")
+    parser.add_argument("--filtro", default="", help="Só benchmarks cujo nome contém este texto")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    results = {}
+    groups = [
+        ("audio", lambda: bench_audio(results, args.rapido)),
+        ("particulas", lambda: bench_particles(results, screen, args.rapido)),
+        ("cenario", lambda: bench_scenery(results, screen, args.rapido)),
+        ("render", lambda: bench_render(results, screen, args.rapido)),
+        ("simulacao", lambda: bench_simulation(results, args.rapido)),
+    ]
+    # Um filtro que começa com o nome de um grupo roda só esse grupo
+    selected = [g for g in groups if args.filtro.startswith(g[0])] or groups
+    for _, run in selected:
+        run()
+    results = {name: r for name, r in results.items() if args.filtro in name}
+
+    for name, result in results.items():
+        print(f"{name:<32}{result['median_us']:12.1f} µs")
+
+    current = {'meta': metadata(), 'results': results}
+    with open(args.saida, 'w') as f:
+        json.dump(current, f, indent=2)
+
+    if args.comparar:
+        with open(args.comparar) as f:
+            baseline = json.load(f)
+        print()
+        regressions = compare(current, baseline, args.limite)
+        if regressions:
+            print(f"\n{len(regressions)} regressão(ões) acima de {args.limite:.0%}")
+            sys.exit(1)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+import numpy as np
+import pygame
+
+# --- CÉU ESTRELADO VETORIZADO ---
+# Posição, tamanho, fase e velocidade do brilho de cada estrela ficam em
+# arrays NumPy. Os pixels de cada estrela (o mesmo disco que
+# pygame.draw.circle desenharia) são calculados uma vez; redesenhar é
+# calcular o brilho de todas com um np.sin e escrever esses pixels direto
+# na superfície, sem um laço em Python por estrela.
+def circle_offsets(radius):
+    # Deslocamentos (dx, dy) dos pixels de um círculo de raio 'radius'
+    size = 2 * radius + 1
+    stamp = pygame.Surface((size, size), 0, 32)
+    pygame.draw.circle(stamp, (255, 255, 255), (radius, radius), radius)
+    dx, dy = np.nonzero(pygame.surfarray.array2d(stamp))
+    return dx - radius, dy - radius
+
+
+class StarField:
+    def __init__(self, count, width, height, min_size=1, max_size=3, max_rects=64, seed=None):
+        rng = np.random.default_rng(seed)
+        self.count = count
+        self.x = rng.integers(0, width, count, endpoint=True)
+        self.y = rng.integers(0, height, count, endpoint=True)
+        self.size = rng.integers(min_size, max_size, count, endpoint=True)
+        self.phase = rng.random(count) * 2 * np.pi
+        self.twinkle_speed = rng.uniform(0.02, 0.05, count)
+        self.max_rects = max_rects  # Acima disso, a área suja é a faixa toda
+
+        bottom = int((self.y + self.size).max()) + 1 if count else 0
+        self.area = pygame.Rect(0, 0, width, bottom)
+
+        # Pixels de todas as estrelas e a estrela dona de cada um
+        xs, ys, owners = [], [], []
+        # (sorted(set()) em vez de np.unique, que importa numpy.ma: ~35 ms no início)
+        for radius in sorted(set(self.size.tolist())):
+            stars = np.flatnonzero(self.size == radius)
+            dx, dy = circle_offsets(int(radius))
+            xs.append((self.x[stars, None] + dx).ravel())
+            ys.append((self.y[stars, None] + dy).ravel())
+            owners.append(np.repeat(stars, len(dx)))
+        xs, ys, owners = (np.concatenate(a) if a else np.zeros(0, dtype=np.int64)
+                          for a in (xs, ys, owners))
+        inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < bottom)
+        self.pixel_x = xs[inside]
+        self.pixel_y = ys[inside]
+        self.pixel_owner = owners[inside]
+
+        self.wave = np.zeros(count)
+        self.brightness = np.zeros(count, dtype=np.uint32)
+        self.pixel_values = np.zeros(len(self.pixel_owner), dtype=np.uint32)
+
+    def update(self):
+        self.phase += self.twinkle_speed
+
+    def create_layer(self):
+        # Superfície de 32 bits só da faixa com estrelas, preto transparente
+        layer = pygame.Surface(self.area.size, 0, 32)
+        layer.set_colorkey((0, 0, 0))
+        layer.fill((0, 0, 0))
+        return layer
+
+    def draw(self, layer):
+        # Brilho 155 + 100·sin(fase), em cinza: com os três canais iguais,
+        # o valor do pixel é o mesmo em qualquer ordem RGB/BGR
+        np.sin(self.phase, out=self.wave)
+        self.wave *= 100
+        np.trunc(self.wave, out=self.wave)
+        self.wave += 155
+        np.copyto(self.brightness, self.wave, casting='unsafe')
+        self.brightness *= 0x010101
+        np.take(self.brightness, self.pixel_owner, out=self.pixel_values)
+        pixels = pygame.surfarray.pixels2d(layer)
+        pixels[self.pixel_x, self.pixel_y] = self.pixel_values
+        del pixels  # Libera a trava da superfície
+
+    def rects(self):
+        # Áreas que mudam quando o brilho é redesenhado
+        if self.count > self.max_rects:
+            return [self.area.copy()]
+        return [pygame.Rect(x - size, y - size, size * 2 + 1, size * 2 + 1)
+                for x, y, size in zip(self.x.tolist(), self.y.tolist(), self.size.tolist())]
+
+
+# --- CAMADAS DE NUVENS COM PARALAXE ---
+# Cada camada tem a sua velocidade, escala e transparência: as do fundo são
+# menores, mais apagadas e mais lentas. Cada nuvem é desenhada uma única vez
+# num sprite; por passo só as posições (arrays) andam, e o desenho é uma
+# chamada a surface.blits() com todos os sprites. Com 'shape_seed', o
+# tamanho das nuvens é o mesmo em toda execução (só a posição é sorteada) e
+# os sprites podem vir do cache em disco ('cache', ver recursos.AssetCache).
+def render_cloud(width, height, alpha):
+    # Nuvem simples 2D: base e dois detalhes arredondados
+    color = (180, 180, 200, alpha)
+    cloud_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    pygame.draw.ellipse(cloud_surface, color, (0, 0, width, height))
+    pygame.draw.ellipse(cloud_surface, color, (width * 0.2, -height * 0.2, width * 0.3, height))
+    pygame.draw.ellipse(cloud_surface, color, (width * 0.5, -height * 0.1, width * 0.3, height))
+    return cloud_surface
+
+
+class CloudLayer:
+    def __init__(self, count, width, top, bottom, speed, scale=1.0, alpha=100, seed=None,
+                 shape_seed=None, cache=None):
+        self.rng = np.random.default_rng(seed)
+        self.width = width
+        self.top = top
+        self.bottom = bottom
+        self.speed = speed
+        self.alpha = alpha
+        self.cache = cache
+        shapes = self.rng if shape_seed is None else np.random.default_rng(shape_seed)
+        self.widths = (shapes.integers(80, 160, count, endpoint=True) * scale).astype(int)
+        self.heights = (shapes.integers(40, 60, count, endpoint=True) * scale).astype(int)
+        self.x = self.rng.integers(0, width, count, endpoint=True).astype(float)
+        self.y = self.rng.integers(top, bottom, count, endpoint=True)
+        self.sprites = None  # Renderizados no primeiro desenho (após abrir a janela)
+        self.drawn_x = np.full(count, -1 << 30)  # Posição informada em rects()
+        self.drawn_y = self.y.copy()
+
+    def move(self):
+        self.x -= self.speed
+        wrapped = self.x + self.widths < 0
+        if wrapped.any():
+            # Volta pela direita em outra altura
+            self.x[wrapped] = self.width
+            self.y[wrapped] = self.rng.integers(self.top, self.bottom, int(wrapped.sum()),
+                                                endpoint=True)
+
+    def blits(self):
+        # Pares (sprite, posição) para surface.blits()
+        if self.sprites is None:
+            convert = pygame.display.get_surface() is not None
+            sizes = list(zip(self.widths.tolist(), self.heights.tolist()))
+
+            def build():
+                return [render_cloud(width, height, self.alpha) for width, height in sizes]
+
+            sprites = build() if self.cache is None else self.cache.surfaces(
+                "nuvens", (sizes, self.alpha), build)
+            self.sprites = [sprite.convert_alpha() if convert else sprite for sprite in sprites]
+        return zip(self.sprites, zip(self.x.astype(int).tolist(), self.y.tolist()))
+
+    def rects(self):
+        # Nuvens que andaram ao menos um pixel desde a última chamada
+        # (posição antiga e nova)
+        x = self.x.astype(int)
+        moved = np.flatnonzero((x != self.drawn_x) | (self.y != self.drawn_y))
+        rects = []
+        for i in moved.tolist():
+            size = (int(self.widths[i]) + 1, int(self.heights[i]))
+            rects.append(pygame.Rect((int(x[i]), int(self.y[i])), size))
+            if self.drawn_x[i] != -1 << 30:
+                rects.append(pygame.Rect((int(self.drawn_x[i]), int(self.drawn_y[i])), size))
+        self.drawn_x[moved] = x[moved]
+        self.drawn_y[moved] = self.y[moved]
+        return rects
+
+
+# --- RENDERIZADOR DE FUNDO EM CAMADAS ---
+# O céu em gradiente e a grama não mudam: são desenhados uma única vez numa
+# camada estática. As estrelas ficam numa camada própria, redesenhada só a
+# cada 'star_refresh' passos (o brilho muda devagar), e as nuvens são
+# sprites pré-renderizados. Desenhar o fundo vira poucos blits.
+# update() avança a animação um passo da simulação e draw() só desenha,
+# então o movimento não depende da taxa de quadros. Com 'cache', a camada
+# estática é lida do disco em vez de redesenhada linha a linha.
+class BackgroundRenderer:
+    def __init__(self, width, height, sky_color, grass_color, starfield, cloud_layers,
+                 grass_height=50, star_refresh=3, cache=None):
+        self.width = width
+        self.height = height
+        self.sky_color = sky_color
+        self.grass_color = grass_color
+        self.grass_height = grass_height
+        self.starfield = starfield
+        self.cloud_layers = cloud_layers  # Do fundo para a frente
+        self.star_refresh = star_refresh
+        self.cache = cache
+        self.frame = 0
+        # As camadas são criadas no primeiro desenho, quando a janela já existe
+        self.static_layer = None
+        self.star_layer = None
+        self.stars_changed = True
+
+    def build_static_layer(self):
+        if self.cache is None:
+            layer = self.render_static_layer()
+        else:
+            key = (self.width, self.height, self.sky_color, self.grass_color, self.grass_height)
+            layer = self.cache.surfaces("fundo", key, lambda: [self.render_static_layer()])[0]
+        return layer.convert() if pygame.display.get_surface() else layer
+
+    def render_static_layer(self):
+        layer = pygame.Surface((self.width, self.height))
+
+        # Céu gradiente
+        for i in range(self.height):
+            alpha = i / self.height
+            color = (
+                int(self.sky_color[0] * (1 - alpha * 0.3)),
+                int(self.sky_color[1] * (1 - alpha * 0.3)),
+                int(self.sky_color[2] * (1 - alpha * 0.3))
+            )
+            pygame.draw.line(layer, color, (0, i), (self.width, i))
+
+        # Grama estática
+        grass_top = self.height - self.grass_height
+        pygame.draw.rect(layer, self.grass_color, (0, grass_top, self.width, self.grass_height))
+
+        # Linha de divisão suave entre grama e céu
+        pygame.draw.line(layer, (44, 159, 44), (0, grass_top), (self.width, grass_top), 2)
+        return layer
+
+    def update(self):
+        # Estrelas: o brilho avança todo passo, o desenho só de vez em quando
+        self.starfield.update()
+        if self.star_layer is not None and self.frame % self.star_refresh == 0:
+            self.starfield.draw(self.star_layer)
+            self.stars_changed = True
+
+        for layer in self.cloud_layers:
+            layer.move()
+
+        self.frame += 1
+
+    def animated_rects(self):
+        # Áreas que mudaram desde a última chamada, para a atualização por
+        # retângulos sujos: nuvens que andaram e as estrelas, se redesenhadas
+        rects = []
+        for layer in self.cloud_layers:
+            rects.extend(layer.rects())
+        if self.stars_changed:
+            rects.extend(self.starfield.rects())
+            self.stars_changed = False
+        return rects
+
+    def draw(self, surface, animated=True):
+        # animated=False desenha só a camada estática (qualidade reduzida)
+        if self.static_layer is None:
+            self.static_layer = self.build_static_layer()
+            self.star_layer = self.starfield.create_layer()
+            self.starfield.draw(self.star_layer)
+
+        surface.blit(self.static_layer, (0, 0))
+        if not animated:
+            return
+
+        surface.blit(self.star_layer, self.starfield.area)
+        for layer in self.cloud_layers:
+            surface.blits(layer.blits(), doreturn=False)
@@ -0,0 +1,54 @@
+# --- CONFIGURAÇÕES COMPARTILHADAS ---
+# Constantes usadas tanto pelo jogo com janela quanto pela simulação sem
+# janela (simulacao.py), que não pode depender de pygame.display.
+
+# Tela
+SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
+
+# Passo fixo da simulação (um passo por quadro a 60 FPS)
+TICK_RATE = 60
+
+# Pássaro
+BIRD_X = 100
+BIRD_SIZE = 40
+
+# Áudio
+NOISE_THRESHOLD = 0.01
+
+# Física do jogador
+GRAVITY = 0.15  # Reduzido para cair mais devagar
+LIFT_FORCE = -1.2  # Reduzido para subir mais suavemente
+VOLUME_SENSITIVITY = 15  # Reduzido para ter mais controle
+MAX_VELOCITY = 5  # Limitar a velocidade máxima
+
+# Controle por tom: a frequência entre PITCH_MIN_HZ e PITCH_MAX_HZ vira a
+# altura alvo do pássaro; estimativas com confiança abaixo de
+# PITCH_CONFIDENCE são ignoradas (o pássaro cai como no modo volume)
+PITCH_MIN_HZ = 110.0  # Lá 2: chão
+PITCH_MAX_HZ = 440.0  # Lá 4: teto
+PITCH_SCALE = "semitons"  # ou "hz" (linear)
+PITCH_CONFIDENCE = 0.8
+PITCH_FOLLOW = 0.1  # Fração da distância ao alvo percorrida por passo
+
+# Obstáculos
+OBSTACLE_WIDTH = 70
+OBSTACLE_SPEED = 4
+GAP_HEIGHT = 200
+OBSTACLE_FREQUENCY = 2000  # Intervalo entre obstáculos (ms)
+
+# Parâmetros ajustáveis da simulação, com os valores padrão acima
+DEFAULT_PARAMS = {
+    'GRAVITY': GRAVITY,
+    'LIFT_FORCE': LIFT_FORCE,
+    'VOLUME_SENSITIVITY': VOLUME_SENSITIVITY,
+    'MAX_VELOCITY': MAX_VELOCITY,
+    'NOISE_THRESHOLD': NOISE_THRESHOLD,
+    'PITCH_MIN_HZ': PITCH_MIN_HZ,
+    'PITCH_MAX_HZ': PITCH_MAX_HZ,
+    'PITCH_SCALE': PITCH_SCALE,
+    'PITCH_CONFIDENCE': PITCH_CONFIDENCE,
+    'PITCH_FOLLOW': PITCH_FOLLOW,
+    'OBSTACLE_SPEED': OBSTACLE_SPEED,
+    'GAP_HEIGHT': GAP_HEIGHT,
+    'OBSTACLE_FREQUENCY': OBSTACLE_FREQUENCY,
+}
@@ -0,0 +1,156 @@
+import numpy as np
+import pygame
+
+# --- BANDAS DE FREQUÊNCIA ---
+# Agrupa os bins da rFFT em bandas com espaçamento logarítmico ou mel por
+# meio de uma matriz de pesos (filtros triangulares) calculada uma vez.
+# Diferente de pegar um bin a cada N, as bandas graves (onde fica a voz)
+# ganham resolução e nenhum bin é descartado.
+def hz_to_mel(hz):
+    return 2595 * np.log10(1 + np.asarray(hz) / 700)
+
+
+def mel_to_hz(mel):
+    return 700 * (10 ** (np.asarray(mel) / 2595) - 1)
+
+
+class BandMapper:
+    def __init__(self, n_bins, sample_rate, n_bands=64, f_min=60.0, f_max=8000.0, scale="log"):
+        if scale not in ("log", "mel"):
+            raise ValueError(f"Escala de bandas desconhecida: {scale}")
+        self.n_bins = n_bins
+        self.n_bands = n_bands
+        self.scale = scale
+        window_size = (n_bins - 1) * 2
+        bin_hz = np.arange(n_bins) * sample_rate / window_size
+
+        # n_bands + 2 bordas: cada banda é um triângulo entre a borda
+        # anterior e a seguinte, com pico na sua própria
+        if scale == "mel":
+            edges = mel_to_hz(np.linspace(hz_to_mel(f_min), hz_to_mel(f_max), n_bands + 2))
+        else:
+            edges = np.geomspace(f_min, f_max, n_bands + 2)
+        self.centers = edges[1:-1]
+
+        lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+        rising = (bin_hz - lower) / (center - lower)
+        falling = (upper - bin_hz) / (upper - center)
+        weights = np.maximum(0, np.minimum(rising, falling))
+
+        # Bandas mais estreitas que um bin ficam com o bin mais próximo
+        empty = weights.sum(axis=1) == 0
+        nearest = np.abs(bin_hz[None, :] - center).argmin(axis=1)
+        weights[empty, nearest[empty]] = 1
+        # Normalizar para cada banda ser a média ponderada dos seus bins
+        weights /= weights.sum(axis=1, keepdims=True)
+        self.weights = weights.astype(np.float32)
+
+    def apply(self, magnitude, out):
+        # magnitude: (n_bins,) linear -> out: (n_bands,) linear
+        return np.matmul(self.weights, magnitude, out=out)
+
+
+# --- SUAVIZAÇÃO COM ATAQUE/RELEASE E PICO RETIDO ---
+class SpectrumSmoother:
+    def __init__(self, n_bands, attack=0.6, release=0.15, peak_hold=30, peak_decay=0.5):
+        self.attack = attack  # Fração do caminho percorrida ao subir
+        self.release = release  # ... e ao descer
+        self.peak_hold = peak_hold  # Quadros que o pico fica parado
+        self.peak_decay = peak_decay  # Queda do pico por quadro depois disso
+        self.values = np.zeros(n_bands, dtype=np.float32)
+        self.peaks = np.zeros(n_bands, dtype=np.float32)
+        self.hold = np.zeros(n_bands, dtype=np.int32)
+        self.rate = np.zeros(n_bands, dtype=np.float32)
+        self.delta = np.zeros(n_bands, dtype=np.float32)
+        self.rising = np.zeros(n_bands, dtype=bool)
+
+    def update(self, target):
+        np.greater(target, self.values, out=self.rising)
+        np.copyto(self.rate, self.release)
+        np.copyto(self.rate, self.attack, where=self.rising)
+        np.subtract(target, self.values, out=self.delta)
+        self.delta *= self.rate
+        self.values += self.delta
+
+        # Pico: sobe junto, segura 'peak_hold' quadros e depois desce
+        np.greater_equal(self.values, self.peaks, out=self.rising)
+        np.copyto(self.peaks, self.values, where=self.rising)
+        np.copyto(self.hold, self.peak_hold, where=self.rising)
+        np.subtract(self.hold, 1, out=self.hold, where=~self.rising)
+        np.less(self.hold, 0, out=self.rising)
+        np.subtract(self.peaks, self.peak_decay, out=self.peaks, where=self.rising)
+        np.maximum(self.peaks, self.values, out=self.peaks)
+        np.maximum(self.hold, -1, out=self.hold)
+        return self.values
+
+
+# --- DESENHO DO ESPECTRÔMETRO ---
+# Todas as barras são montadas num único array de pixels (coluna -> banda)
+# com operações vetorizadas e enviadas de uma vez com surfarray. O custo
+# depende só do tamanho da área, não do número de bandas.
+class SpectrumRenderer:
+    def __init__(self, width, height, n_bands, bar_color, glow_color=(255, 255, 255),
+                 max_value=50.0, glow_height=5, alpha=200, gap=1):
+        self.width = width
+        self.height = height
+        self.max_value = max_value
+        self.glow_height = glow_height
+        self.surface = pygame.Surface((width, height))
+        self.key = (0, 0, 0)
+        self.surface.set_colorkey(self.key)
+        self.surface.set_alpha(alpha)
+        self.bar_pixel = self.surface.map_rgb(bar_color)
+        self.glow_pixel = self.surface.map_rgb(glow_color)
+        self.key_pixel = self.surface.map_rgb(self.key)
+
+        # Banda de cada coluna de pixels; colunas de espaço entre barras apontam
+        # para uma banda extra sempre vazia
+        bar_width = width / n_bands
+        columns = np.arange(width)
+        self.column_band = np.minimum((columns / bar_width).astype(np.int32), n_bands - 1)
+        in_gap = (columns - self.column_band * bar_width) >= bar_width - gap
+        if bar_width > gap + 1:
+            self.column_band[in_gap] = n_bands
+
+        # Tabela com a coluna de pixels pronta para cada altura possível de
+        # barra (transparente acima, brilho no topo, cor da barra abaixo)
+        self.strips = np.full((height + 1, height), self.key_pixel, dtype=np.uint32)
+        for h in range(1, height + 1):
+            self.strips[h, height - h:] = self.bar_pixel
+            self.strips[h, height - h:height - h + glow_height] = self.glow_pixel
+
+        self.columns = np.arange(width)
+        self.band_heights = np.zeros(n_bands + 1, dtype=np.int32)
+        self.peak_rows = np.zeros(n_bands + 1, dtype=np.int32)
+        self.column_heights = np.zeros(width, dtype=np.int32)
+        self.column_peaks = np.zeros(width, dtype=np.int32)
+        self.band_has_peak = np.zeros(n_bands + 1, dtype=bool)
+        self.column_has_peak = np.zeros(width, dtype=bool)
+        self.pixels = np.zeros((width, height), dtype=np.uint32)
+        self.used_height = height  # Altura da barra ou pico mais alto no último render
+
+    def render(self, values, peaks=None):
+        scale = self.height / self.max_value
+        n = len(values)
+        np.clip(np.asarray(values) * scale, 0, self.height, out=self.band_heights[:n], casting='unsafe')
+
+        # Cada coluna copia a faixa pronta da sua altura: uma única operação
+        np.take(self.band_heights, self.column_band, out=self.column_heights)
+        np.take(self.strips, self.column_heights, axis=0, out=self.pixels)
+        self.used_height = int(self.band_heights[:n].max(initial=0))
+
+        # Marca do pico retido (um pixel por coluna)
+        if peaks is not None:
+            np.clip(self.height - np.asarray(peaks) * scale, 0, self.height - 1,
+                    out=self.peak_rows[:n], casting='unsafe')
+            # Bandas sem pico e colunas de espaço não desenham marca
+            np.greater_equal(np.asarray(peaks) * scale, 1, out=self.band_has_peak[:n])
+            np.take(self.peak_rows, self.column_band, out=self.column_peaks)
+            np.take(self.band_has_peak, self.column_band, out=self.column_has_peak)
+            columns = self.columns[self.column_has_peak]
+            self.pixels[columns, self.column_peaks[columns]] = self.glow_pixel
+            if len(columns):
+                self.used_height = max(self.used_height, self.height - int(self.column_peaks[columns].min()))
+
+        pygame.surfarray.blit_array(self.surface, self.pixels)
+        return self.surface
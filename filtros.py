@@ -0,0 +1,177 @@
+import numpy as np
+
+# --- FILTROS IIR EM BLOCOS ---
+# Biquads do "Audio EQ Cookbook" (RBJ). Os coeficientes são (b, a) com a[0] = 1.
+def biquad_highpass(cutoff, sample_rate, q=0.7071):
+    w = 2 * np.pi * cutoff / sample_rate
+    alpha = np.sin(w) / (2 * q)
+    cos = np.cos(w)
+    b = np.array([(1 + cos) / 2, -(1 + cos), (1 + cos) / 2])
+    a = np.array([1 + alpha, -2 * cos, 1 - alpha])
+    return b / a[0], a / a[0]
+
+
+def biquad_lowpass(cutoff, sample_rate, q=0.7071):
+    w = 2 * np.pi * cutoff / sample_rate
+    alpha = np.sin(w) / (2 * q)
+    cos = np.cos(w)
+    b = np.array([(1 - cos) / 2, 1 - cos, (1 - cos) / 2])
+    a = np.array([1 + alpha, -2 * cos, 1 - alpha])
+    return b / a[0], a / a[0]
+
+
+# Filtrar amostra por amostra em Python custaria caro a cada bloco. Como o
+# filtro é linear, a saída de um bloco de n amostras é
+#     y = T x + O s
+# onde T é a matriz (Toeplitz) com a resposta ao impulso, O leva o estado s
+# do fim do bloco anterior à saída, e o novo estado também é um produto de
+# matrizes. Tudo é calculado uma vez para blocos de até 'max_block'
+# amostras; por bloco restam só multiplicações de matrizes, sem alocação.
+class BlockIIR:
+    def __init__(self, b, a, channels=1, max_block=1024):
+        b = np.asarray(b, dtype=np.float64)
+        a = np.asarray(a, dtype=np.float64)
+        order = len(a) - 1
+        b = np.concatenate([b, np.zeros(order + 1 - len(b))])
+        self.order = order
+        self.max_block = max_block
+
+        # Espaço de estados da forma direta II transposta
+        A = np.zeros((order, order))
+        A[:, 0] = -a[1:]
+        A[:-1, 1:] = np.eye(order - 1)
+        B = b[1:] - a[1:] * b[0]
+        C = np.zeros(order)
+        C[0] = 1
+        D = b[0]
+
+        powers = np.empty((max_block + 1, order, order))  # A^k
+        powers[0] = np.eye(order)
+        for k in range(max_block):
+            powers[k + 1] = powers[k] @ A
+        self.state_powers = powers
+        # Colunas A^(L-1) B, ..., A B, B: as últimas n servem para um bloco de n
+        self.input_to_state = (powers[max_block - 1::-1] @ B).T.copy()
+        self.state_to_output = np.einsum('j,kji->ki', C, powers[:max_block])  # Linha k: C A^k
+
+        impulse = np.empty(max_block)
+        impulse[0] = D
+        impulse[1:] = self.state_to_output[:max_block - 1] @ B
+        rows = np.arange(max_block)
+        lags = rows[:, None] - rows[None, :]
+        self.toeplitz = np.where(lags >= 0, impulse[np.maximum(lags, 0)], 0).astype(np.float32)
+
+        self.state = np.zeros((order, channels))
+        self.next_state = np.zeros((order, channels))
+        self.from_state = np.zeros((max_block, channels))
+        self.out = np.zeros((max_block, channels), dtype=np.float32)
+
+    def reset(self):
+        self.state[:] = 0
+
+    def process(self, block):
+        # Filtra 'block' (n, canais) continuando do bloco anterior. Retorna
+        # uma visão do buffer interno, válida até a próxima chamada
+        n = len(block)
+        if n > self.max_block:
+            raise ValueError(f"Bloco de {n} amostras maior que max_block={self.max_block}")
+        out = self.out[:n]
+        np.matmul(self.toeplitz[:n, :n], block, out=out)
+        np.matmul(self.state_to_output[:n], self.state, out=self.from_state[:n])
+        out += self.from_state[:n]
+
+        np.matmul(self.state_powers[n], self.state, out=self.next_state)
+        np.matmul(self.input_to_state[:, self.max_block - n:], block, out=self.state)
+        self.state += self.next_state
+        return out
+
+
+def voice_bandpass(sample_rate, low_hz=80.0, high_hz=4000.0, channels=1, max_block=1024):
+    # Passa-altas + passa-baixas em cascata (4ª ordem): corta o zumbido de
+    # ventiladores e da rede elétrica e o chiado acima da faixa da voz
+    b_high, a_high = biquad_highpass(low_hz, sample_rate)
+    b_low, a_low = biquad_lowpass(high_hz, sample_rate)
+    return BlockIIR(np.convolve(b_high, b_low), np.convolve(a_high, a_low), channels, max_block)
+
+
+# --- PERFIL DE RUÍDO E LIMIAR ADAPTATIVO ---
+# A calibração (tela do menu, em silêncio) mede a média do RMS e do
+# espectro de magnitude. Depois disso o perfil continua se ajustando: desce
+# rápido quando o sinal fica abaixo dele e sobe devagar em quadros que não
+# passam do limiar (ruído), então a voz não contamina a estimativa. Cada
+# canal (um microfone por jogador) tem o seu perfil, atualizado em arrays
+# (n_bins, canais) numa única passada.
+class NoiseProfile:
+    def __init__(self, n_bins, channels=1, margin=2.0, min_gate=0.003, initial_gate=0.01,
+                 fall=0.2, rise=0.005, subtract=1.0, spectral_floor=0.05):
+        self.margin = margin  # Limiar = margin x RMS do ruído
+        self.min_gate = min_gate
+        self.fall = fall
+        self.rise = rise
+        self.subtract = subtract  # Fator da subtração espectral (0 desliga)
+        self.spectral_floor = spectral_floor  # Fração mínima da magnitude mantida
+        # Antes da calibração, o limiar começa em 'initial_gate'
+        self.noise_rms = np.full(channels, initial_gate / margin)
+        self.noise_magnitude = np.zeros((n_bins, channels), dtype=np.float32)
+        self.calibrating = 0  # Análises restantes da calibração
+        self.calibration_frames = 0
+        self.calibrated = False
+        self.rms_sum = np.zeros(channels)
+        self.magnitude_sum = np.zeros((n_bins, channels), dtype=np.float64)
+        self.gates = np.zeros(channels)
+        self.quiet = np.zeros(channels, dtype=bool)
+        self.rms_rate = np.zeros(channels)
+        self.below = np.zeros((n_bins, channels), dtype=bool)
+        self.rate = np.zeros((n_bins, channels), dtype=np.float32)
+        self.delta = np.zeros((n_bins, channels), dtype=np.float32)
+        self.floor = np.zeros((n_bins, channels), dtype=np.float32)
+
+    @property
+    def gate(self):
+        # Limiar de cada canal
+        np.multiply(self.noise_rms, self.margin, out=self.gates)
+        return np.maximum(self.gates, self.min_gate, out=self.gates)
+
+    def start_calibration(self, frames):
+        self.calibrating = self.calibration_frames = frames
+        self.rms_sum[:] = 0
+        self.magnitude_sum[:] = 0
+
+    def update(self, rms, magnitude):
+        # rms: (canais,); magnitude: (n_bins, canais)
+        if self.calibrating:
+            self.rms_sum += rms
+            self.magnitude_sum += magnitude
+            self.calibrating -= 1
+            if self.calibrating == 0:
+                np.divide(self.rms_sum, self.calibration_frames, out=self.noise_rms)
+                np.divide(self.magnitude_sum, self.calibration_frames, out=self.noise_magnitude,
+                          casting='unsafe')
+                self.calibrated = True
+            return
+
+        # Só os canais abaixo do limiar (ruído) mexem no perfil
+        np.less(rms, self.gate, out=self.quiet)
+        if not self.quiet.any():
+            return
+        np.copyto(self.rms_rate, self.rise)
+        np.copyto(self.rms_rate, self.fall, where=rms < self.noise_rms)
+        self.rms_rate *= self.quiet
+        self.noise_rms += self.rms_rate * (rms - self.noise_rms)
+        np.less(magnitude, self.noise_magnitude, out=self.below)
+        np.copyto(self.rate, self.rise)
+        np.copyto(self.rate, self.fall, where=self.below)
+        self.rate *= self.quiet
+        np.subtract(magnitude, self.noise_magnitude, out=self.delta)
+        self.delta *= self.rate
+        self.noise_magnitude += self.delta
+
+    def apply(self, magnitude):
+        # Subtração espectral no lugar: max(|X| - k·ruído, piso·|X|)
+        if not self.subtract or not self.calibrated:
+            return magnitude
+        np.multiply(magnitude, self.spectral_floor, out=self.floor)
+        np.multiply(self.noise_magnitude, self.subtract, out=self.delta)
+        np.subtract(magnitude, self.delta, out=magnitude)
+        np.maximum(magnitude, self.floor, out=magnitude)
+        return magnitude
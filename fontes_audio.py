@@ -0,0 +1,313 @@
+import queue
+import struct
+import threading
+import time
+import types
+import wave
+import numpy as np
+
+# --- FONTES DE ÁUDIO ---
+# Todas as fontes chamam o callback com a mesma assinatura do sounddevice:
+# callback(indata, frames, time_, status), com indata float32 (frames, canais)
+# e time_ com inputBufferAdcTime/currentTime. Assim o jogo não sabe se o
+# áudio vem do microfone, de um arquivo ou de um gerador.
+class AudioSource:
+    def __init__(self, callback, sample_rate=44100, block_size=512, channels=1):
+        self.callback = callback
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.channels = channels
+
+    def start(self):
+        raise NotImplementedError
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class MicrophoneSource(AudioSource):
+    def __init__(self, callback, sample_rate=44100, block_size=512, channels=1, device=None):
+        super().__init__(callback, sample_rate, block_size, channels)
+        self.device = device
+        self.stream = None
+
+    def start(self):
+        # Importado só aqui: máquinas sem PortAudio ainda usam as outras fontes
+        import sounddevice as sd
+        self.stream = sd.InputStream(channels=self.channels, callback=self.callback,
+                                     samplerate=self.sample_rate, blocksize=self.block_size,
+                                     device=self.device)
+        self.stream.start()
+
+    def stop(self):
+        if self.stream is not None:
+            self.stream.stop()
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+
+# Fontes que geram os blocos numa thread própria, em tempo real (um bloco
+# a cada block_size / sample_rate segundos) ou o mais rápido possível
+class ThreadedSource(AudioSource):
+    def __init__(self, callback, sample_rate=44100, block_size=512, channels=1, realtime=True):
+        super().__init__(callback, sample_rate, block_size, channels)
+        self.realtime = realtime
+        self.finished = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.block = np.zeros((block_size, channels), dtype=np.float32)
+
+    def fill(self, out):
+        # Preenche 'out' com o próximo bloco; retorna quantos quadros são válidos
+        raise NotImplementedError
+
+    def start(self):
+        self._stop.clear()
+        self.finished.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        period = self.block_size / self.sample_rate
+        start = time.perf_counter()
+        position = 0
+        while not self._stop.is_set():
+            frames = self.fill(self.block)
+            if frames == 0:
+                break
+            stream_time = position / self.sample_rate
+            if self.realtime:
+                # Esperar até o instante em que o bloco estaria completo
+                delay = start + stream_time + period - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            now = time.perf_counter() - start
+            time_info = types.SimpleNamespace(inputBufferAdcTime=stream_time,
+                                              currentTime=now if self.realtime else stream_time + period)
+            self.callback(self.block[:frames], frames, time_info, None)
+            position += frames
+        self.finished.set()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+
+# WAVE_FORMAT_EXTENSIBLE guarda o formato real (PCM ou float) no GUID
+# SubFormat; todos os GUIDs KSDATAFORMAT_SUBTYPE_* terminam com o mesmo sufixo
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+KSDATAFORMAT_SUFFIX = b'\x00\x00\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71'
+
+
+def read_wav_layout(path):
+    # Lê o cabeçalho RIFF/WAVE e retorna (dtype, canais, taxa, início dos dados, quadros)
+    with open(path, 'rb') as f:
+        riff, _, wave_id = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave_id != b'WAVE':
+            raise ValueError(f"{path} não é um arquivo WAV")
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"{path}: bloco 'data' não encontrado")
+            chunk_id, size = struct.unpack('<4sI', header)
+            if chunk_id == b'fmt ':
+                body = f.read(size)
+                fmt = list(struct.unpack('<HHIIHH', body[:16]))
+                if fmt[0] == WAVE_FORMAT_EXTENSIBLE:
+                    # O formato real está no SubFormat (GUID nos bytes 24 a 40):
+                    # os 2 primeiros bytes são o código (1 = PCM, 3 = float) e o
+                    # resto é o sufixo fixo KSDATAFORMAT_SUBTYPE_*
+                    subformat = body[24:40]
+                    if len(subformat) < 16 or subformat[2:] != KSDATAFORMAT_SUFFIX:
+                        raise ValueError(f"{path}: SubFormat WAV não suportado")
+                    fmt[0] = struct.unpack('<H', subformat[:2])[0]
+                f.seek(size & 1, 1)
+            elif chunk_id == b'data':
+                if fmt is None:
+                    raise ValueError(f"{path}: bloco 'fmt ' ausente")
+                offset = f.tell()
+                break
+            else:
+                f.seek(size + (size & 1), 1)
+
+    audio_format, channels, sample_rate, _, _, bits = fmt
+    if audio_format == 3 and bits == 32:
+        dtype = np.float32
+    elif audio_format == 1 and bits in (8, 16, 32):
+        dtype = {8: np.uint8, 16: np.int16, 32: np.int32}[bits]
+    else:
+        raise ValueError(f"{path}: formato WAV não suportado ({audio_format}, {bits} bits)")
+    frames = size // (channels * np.dtype(dtype).itemsize)
+    return dtype, channels, sample_rate, offset, frames
+
+
+def to_float32(samples, out):
+    # Converte PCM inteiro para float32 em [-1, 1] escrevendo em 'out'
+    out[:] = samples
+    if samples.dtype == np.uint8:
+        out -= 128
+        out *= 1 / 128
+    elif samples.dtype.kind == 'i':
+        out *= 1 / np.iinfo(samples.dtype).max
+
+
+class FileSource(ThreadedSource):
+    # Reproduz um WAV ou PCM cru lendo direto do disco com np.memmap.
+    # Para PCM cru, informar raw_dtype, canais e taxa de amostragem.
+    def __init__(self, callback, path, block_size=512, realtime=True, loop=False,
+                 raw_dtype=None, channels=1, sample_rate=44100):
+        if raw_dtype is None:
+            dtype, channels, sample_rate, offset, frames = read_wav_layout(path)
+        else:
+            dtype, offset = np.dtype(raw_dtype), 0
+            frames = None
+        self.samples = np.memmap(path, dtype=dtype, mode='r', offset=offset)
+        if frames is None:
+            frames = len(self.samples) // channels
+        self.samples = self.samples[:frames * channels].reshape(frames, channels)
+        super().__init__(callback, sample_rate, block_size, channels, realtime)
+        self.path = path
+        self.loop = loop
+        self.position = 0
+
+    def fill(self, out):
+        total = len(self.samples)
+        if self.position >= total:
+            if not self.loop or total == 0:
+                return 0
+            self.position = 0
+        end = min(self.position + len(out), total)
+        frames = end - self.position
+        to_float32(self.samples[self.position:end], out[:frames])
+        self.position = end
+        return frames
+
+
+class SyntheticSource(ThreadedSource):
+    # Gerador de testes: "tone" (senoide), "noise" (ruído branco) ou
+    # "bursts" (tom ligado e desligado a cada 'burst_period' segundos)
+    def __init__(self, callback, kind="tone", frequency=220.0, amplitude=0.05, burst_period=1.0,
+                 sample_rate=44100, block_size=512, channels=1, realtime=True, duration=None,
+                 seed=None):
+        if kind not in ("tone", "noise", "bursts"):
+            raise ValueError(f"Sinal sintético desconhecido: {kind}")
+        super().__init__(callback, sample_rate, block_size, channels, realtime)
+        self.kind = kind
+        self.frequency = frequency
+        self.amplitude = amplitude
+        self.burst_period = burst_period
+        self.total = None if duration is None else int(duration * sample_rate)
+        self.position = 0
+        self.rng = np.random.default_rng(seed)
+        self.phase_step = 2 * np.pi * frequency / sample_rate
+        self.index = np.arange(block_size)
+        self.scratch = np.zeros(block_size)
+
+    def fill(self, out):
+        frames = len(out)
+        if self.total is not None:
+            frames = min(frames, self.total - self.position)
+            if frames <= 0:
+                return 0
+        scratch = self.scratch[:frames]
+        if self.kind == "noise":
+            scratch[:] = self.rng.standard_normal(frames)
+            scratch *= self.amplitude / 3
+        else:
+            np.add(self.index[:frames], self.position, out=scratch)
+            scratch *= self.phase_step
+            np.sin(scratch, out=scratch)
+            scratch *= self.amplitude
+            if self.kind == "bursts" and int(self.position / self.sample_rate / self.burst_period) % 2:
+                scratch[:] = 0
+        out[:frames] = scratch[:, None]
+        self.position += frames
+        return frames
+
+
+# --- GRAVAÇÃO DE SESSÃO ---
+# O callback só copia o bloco para uma fila; uma thread grava o WAV (PCM
+# 16 bits). Se o disco não acompanhar, blocos são descartados e contados
+# em 'dropped' em vez de travar o áudio. Um erro na gravação (caminho
+# inválido, disco cheio) é mostrado e guardado em 'error'; a partir daí os
+# blocos são só descartados, e stop() nunca espera uma thread que morreu.
+class SessionRecorder:
+    def __init__(self, path, sample_rate=44100, channels=1, max_pending=256):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.queue = queue.Queue(max_pending)
+        self.dropped = 0
+        self.error = None
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, block):
+        if self.error is not None:
+            self.dropped += 1
+            return
+        try:
+            self.queue.put_nowait(block.copy())
+        except queue.Full:
+            self.dropped += 1
+
+    def wrap(self, callback):
+        # Retorna um callback que grava o bloco e repassa para 'callback'
+        def recording_callback(indata, frames, time_, status):
+            self.write(indata)
+            callback(indata, frames, time_, status)
+        return recording_callback
+
+    def _run(self):
+        try:
+            # Arquivo aberto antes: se open() falhar, wave nem chega a ser criado
+            with open(self.path, 'wb') as raw, wave.open(raw, 'wb') as f:
+                f.setnchannels(self.channels)
+                f.setsampwidth(2)
+                f.setframerate(self.sample_rate)
+                while True:
+                    block = self.queue.get()
+                    if block is None:
+                        break
+                    pcm = (np.clip(block, -1, 1) * 32767).astype('<i2')
+                    f.writeframes(pcm.tobytes())
+        except (OSError, wave.Error) as e:
+            self.error = e
+            print(f"Gravação de {self.path} interrompida: {e}")
+
+    def stop(self, timeout=5.0):
+        if self._thread is not None:
+            if self._thread.is_alive():
+                try:
+                    self.queue.put(None, timeout=timeout)
+                except queue.Full:
+                    pass
+                self._thread.join(timeout)
+            self._thread = None
+
+
+def open_source(spec, callback, sample_rate=44100, block_size=512, channels=1):
+    # Cria a fonte a partir de um texto: "mic", "arquivo:caminho.wav",
+    # "arquivo-rapido:caminho.wav" (sem esperar o tempo real) ou
+    # "sintetico:tone|noise|bursts"
+    kind, _, arg = spec.partition(":")
+    if kind == "mic":
+        return MicrophoneSource(callback, sample_rate, block_size, channels)
+    if kind in ("arquivo", "arquivo-rapido"):
+        return FileSource(callback, arg, block_size, realtime=kind == "arquivo")
+    if kind == "sintetico":
+        return SyntheticSource(callback, arg or "bursts", sample_rate=sample_rate,
+                               block_size=block_size, channels=channels)
+    raise ValueError(f"Fonte de áudio desconhecida: {spec}")
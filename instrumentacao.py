@@ -0,0 +1,185 @@
+import csv
+import json
+import time
+from contextlib import contextmanager
+import numpy as np
+
+# --- INSTRUMENTAÇÃO DE TEMPO POR ETAPA ---
+# Cada etapa do quadro (eventos, áudio, física, desenhos...) é medida com
+# time.perf_counter. Os últimos 'window' valores de cada etapa ficam num
+# buffer circular para os percentis p50/p95/p99 em tempo real, e um
+# histograma acumulado (faixas de 0,25 ms) guarda a sessão inteira.
+HISTOGRAM_BIN_MS = 0.25
+HISTOGRAM_BINS = 400  # Até 100 ms; valores maiores caem na última faixa
+
+class StageStats:
+    def __init__(self, window):
+        self.values = np.zeros(window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+
+    def add(self, ms):
+        self.values[self.count % len(self.values)] = ms
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+        self.histogram[min(int(ms / HISTOGRAM_BIN_MS), HISTOGRAM_BINS - 1)] += 1
+
+    def recent(self):
+        return self.values[:min(self.count, len(self.values))]
+
+    def percentiles(self):
+        recent = self.recent()
+        if len(recent) == 0:
+            return 0.0, 0.0, 0.0
+        p50, p95, p99 = np.percentile(recent, (50, 95, 99))
+        return float(p50), float(p95), float(p99)
+
+    def summary(self):
+        p50, p95, p99 = self.percentiles()
+        return {'count': self.count, 'mean_ms': self.total / self.count if self.count else 0.0,
+                'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99, 'max_ms': self.max}
+
+
+class _Timer:
+    # Reaproveitado a cada quadro para não alocar um objeto por medição
+    def __init__(self, stats):
+        self.stats = stats
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.add((time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class _NoTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FrameProfiler:
+    def __init__(self, enabled=True, window=600):
+        self.enabled = enabled
+        self.window = window
+        self.stats = {}  # Em ordem de primeira medição
+        self.timers = {}
+        self.no_timer = _NoTimer()
+        self.frame_start = None
+
+    def get_stats(self, name):
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = StageStats(self.window)
+            self.timers[name] = _Timer(stats)
+        return stats
+
+    def stage(self, name):
+        # Uso: with profiler.stage("fisica"): ...
+        if not self.enabled:
+            return self.no_timer
+        timer = self.timers.get(name)
+        if timer is None:
+            self.get_stats(name)
+            timer = self.timers[name]
+        return timer
+
+    def record(self, name, ms):
+        # Medidas feitas fora do loop (trabalhador DSP, latência)
+        if self.enabled:
+            self.get_stats(name).add(ms)
+
+    def end_frame(self):
+        # Tempo total entre duas chamadas (inclui a espera do clock.tick)
+        now = time.perf_counter()
+        if self.enabled and self.frame_start is not None:
+            self.get_stats("quadro").add((now - self.frame_start) * 1000)
+        self.frame_start = now
+
+    def summary(self):
+        return {name: stats.summary() for name, stats in self.stats.items()}
+
+    def draw_overlay(self, surface, font, x=10, y=10):
+        # Painel com p50/p95/p99 de cada etapa
+        lines = [f"{'etapa':<14}{'p50':>7}{'p95':>7}{'p99':>7}  ms"]
+        for name, stats in self.stats.items():
+            p50, p95, p99 = stats.percentiles()
+            lines.append(f"{name:<14}{p50:7.2f}{p95:7.2f}{p99:7.2f}")
+        line_height = font.get_linesize()
+        panel = surface.fill((0, 0, 0), (x - 4, y - 4, 300, line_height * len(lines) + 8))
+        for i, line in enumerate(lines):
+            surface.blit(font.render(line, True, (255, 255, 255)), (x, y + i * line_height))
+        return panel
+
+    def export(self, path, startup=None):
+        # Salva o resumo em .csv (uma linha por etapa) ou .json (com histogramas);
+        # 'startup' (StartupTimer) acrescenta os tempos de inicialização
+        if path.endswith(".csv"):
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(["etapa", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"])
+                for name, s in self.summary().items():
+                    writer.writerow([name, s['count'], f"{s['mean_ms']:.4f}", f"{s['p50_ms']:.4f}",
+                                     f"{s['p95_ms']:.4f}", f"{s['p99_ms']:.4f}", f"{s['max_ms']:.4f}"])
+                for name, ms in (startup.stages if startup is not None else ()):
+                    writer.writerow([f"inicio/{name}", 1] + [f"{ms:.4f}"] * 5)
+        else:
+            data = {'histogram_bin_ms': HISTOGRAM_BIN_MS, 'stages': {}}
+            for name, stats in self.stats.items():
+                entry = stats.summary()
+                entry['histogram'] = stats.histogram[:np.flatnonzero(stats.histogram).max(initial=-1) + 1].tolist()
+                data['stages'][name] = entry
+            if startup is not None:
+                data['startup_ms'] = dict(startup.stages)
+            with open(path, 'w') as f:
+                json.dump(data, f, indent=2)
+
+
+# --- TEMPO DE INICIALIZAÇÃO ---
+# Cada etapa do início (importação, janela, recursos, primeiro quadro,
+# áudio) é medida uma vez; report() lista as etapas e o total desde
+# 'start' (por padrão, a criação do objeto).
+class StartupTimer:
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.stages = []  # (nome, ms), na ordem em que terminaram
+
+    def add(self, name, ms):
+        self.stages.append((name, ms))
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def total(self):
+        return (time.perf_counter() - self.start) * 1000
+
+    def report(self):
+        lines = [f"{name:<18}{ms:8.1f} ms" for name, ms in self.stages]
+        lines.append(f"{'total':<18}{self.total():8.1f} ms")
+        return "\n".join(lines)
+
+
+def capture_time(time_, frames, sample_rate):
+    # Converte o horário do ADC informado pelo callback (relógio do stream)
+    # para time.perf_counter: instante em que a última amostra do bloco foi
+    # capturada. Se o backend não informar o ADC (0), usa a chegada do bloco.
+    now = time.perf_counter()
+    adc = getattr(time_, 'inputBufferAdcTime', 0) or 0
+    current = getattr(time_, 'currentTime', 0) or 0
+    if adc <= 0 or current <= 0:
+        return now
+    return now - (current - adc) + frames / sample_rate
@@ -1,30 +1,51 @@
+import time
+IMPORT_START = time.perf_counter()  # Início da medição do tempo de inicialização
+import argparse
 import pygame
 import numpy as np
-import sounddevice as sd
-import queue
-import random
 import os
-import json
 import math
-
-# --- INICIALIZAÇÃO BÁSICA ---
-pygame.init()
-SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Flappy Voice")
-clock = pygame.time.Clock()
+from audio import DSPWorker, FeatureFrame
+from fontes_audio import open_source, SessionRecorder
+from instrumentacao import FrameProfiler, StartupTimer, capture_time
+from cenario import BackgroundRenderer, StarField, CloudLayer
+from particulas import ParticleSystem
+from sprites import RotationCache, TextCache
+from recursos import AssetCache, LazyFont
+from espectro import SpectrumSmoother, SpectrumRenderer
+from agendador import FixedStepScheduler, QualityGovernor
+from atualizacao import DirtyRectTracker
+from registro import SessionLog
+from persistencia import ScoreStore, GameStats, leaderboard_lines
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, TICK_RATE, BIRD_X, BIRD_SIZE, NOISE_THRESHOLD
+from simulacao import MultiplayerSimulation, CONTROL_PITCH
+
+# --- INICIALIZAÇÃO SOB DEMANDA ---
+# Importar este módulo não abre janela, fontes nem microfone: main() inicia
+# cada subsistema quando ele é necessário (vídeo ao abrir a janela, fontes
+# no primeiro texto, áudio depois do primeiro quadro). Sprites gerados por
+# código e textos renderizados ficam no cache em disco (recursos.py).
+asset_cache = AssetCache()
+CLOCK_START = time.perf_counter()
+
+def elapsed_ms():
+    # Relógio das animações de interface (pygame.time.get_ticks depende de
+    # pygame.init, que não é mais chamado)
+    return (time.perf_counter() - CLOCK_START) * 1000
 
 # Criar o sprite do pássaro usando desenho vetorial
-def create_bird_sprite():
+BIRD_FRAME_COUNT = 2
+
+def create_bird_sprite(color=(255, 200, 0)):
     # Criar superfícies para os frames de animação
     frames = []
-    sizes = [(40, 40)] * 2  # Dois frames do mesmo tamanho
+    sizes = [(40, 40)] * BIRD_FRAME_COUNT  # Dois frames do mesmo tamanho
     
     for size in sizes:
         surf = pygame.Surface(size, pygame.SRCALPHA)
         
         # Corpo do pássaro
-        pygame.draw.ellipse(surf, (255, 200, 0), (5, 5, 30, 30))  # Corpo amarelo
+        pygame.draw.ellipse(surf, color, (5, 5, 30, 30))  # Corpo (amarelo no jogador 1)
         
         # Olho
         pygame.draw.circle(surf, (255, 255, 255), (28, 15), 6)  # Branco do olho
@@ -36,17 +57,33 @@ def create_bird_sprite():
         frames.append(surf)
     
     # Segundo frame com asa levantada
-    pygame.draw.ellipse(frames[1], (230, 180, 0), (8, 15, 20, 8))
+    pygame.draw.ellipse(frames[1], [int(c * 0.9) for c in color], (8, 15, 20, 8))
     
     return frames
 
+# Rotação do pássaro: passo de quantização (graus) e qualidade
+# ("fast" usa rotate, "smooth" usa rotozoom) para comparar o custo
+BIRD_ROTATION_STEP = 1.0
+BIRD_ROTATION_QUALITY = os.environ.get("FLAPPYVOICE_ROTACAO", "fast")
+
 class Bird:
-    def __init__(self, x, y):
-        self.frames = create_bird_sprite()
+    def __init__(self, x, y, color=(255, 200, 0)):
+        self.color = color
+        # Frames e todas as rotações vêm juntos do cache (ou são gerados)
+        smooth = BIRD_ROTATION_QUALITY == "smooth"
+
+        def build():
+            frames = create_bird_sprite(color)
+            return frames + RotationCache(frames, BIRD_ROTATION_STEP, -30, 45, smooth).sprites()
+
+        sprites = asset_cache.surfaces("passaro", (color, BIRD_ROTATION_STEP, -30, 45, smooth), build)
+        self.frames = sprites[:BIRD_FRAME_COUNT]
+        self.rotations = RotationCache(self.frames, BIRD_ROTATION_STEP, -30, 45, smooth=smooth,
+                                       sprites=sprites[BIRD_FRAME_COUNT:])
         self.current_frame = 0
         self.animation_speed = 0.15
         self.animation_time = 0
-        self.rect = pygame.Rect(x, y, 40, 40)
+        self.rect = pygame.Rect(x, y, BIRD_SIZE, BIRD_SIZE)
         self.angle = 0
         self.target_angle = 0
     
@@ -61,15 +98,26 @@ class Bird:
         self.angle += (self.target_angle - self.angle) * 0.1
         self.angle = max(-30, min(45, self.angle))
     
-    def draw(self, surface):
-        # Rotacionar a imagem
-        rotated = pygame.transform.rotate(self.frames[self.current_frame], -self.angle)
+    def draw(self, surface, center=None):
+        # Buscar a imagem já rotacionada no cache
+        rotated = self.rotations.get(self.current_frame, self.angle)
         # Manter o centro da imagem no mesmo lugar após a rotação
-        rect = rotated.get_rect(center=self.rect.center)
-        surface.blit(rotated, rect)
-
-# Criar pássaro
-bird = Bird(100, SCREEN_HEIGHT // 2)
+        # ('center' permite desenhar numa posição interpolada)
+        rect = rotated.get_rect(center=center or self.rect.center)
+        return surface.blit(rotated, rect)
+
+# --- JOGADORES ---
+# Multijogador local: cada canal de áudio (um microfone por jogador numa
+# interface multicanal) controla o seu pássaro, de 1 a 8
+PLAYERS = int(os.environ.get("FLAPPYVOICE_JOGADORES", "1"))
+PLAYER_COLORS = [(255, 200, 0), (90, 200, 255), (255, 110, 150), (140, 235, 110),
+                 (200, 150, 255), (255, 150, 60), (240, 240, 240), (120, 140, 255)]
+
+def create_birds(players):
+    # Um pássaro por jogador (o primeiro é o do jogo de um jogador só)
+    if not 1 <= players <= len(PLAYER_COLORS):
+        raise ValueError(f"Número de jogadores fora de 1 a {len(PLAYER_COLORS)}: {players}")
+    return [Bird(BIRD_X, SCREEN_HEIGHT // 2, color) for color in PLAYER_COLORS[:players]]
 
 # --- CORES E FONTES ---
 WHITE = (255, 255, 255)
@@ -84,89 +132,52 @@ MENU_COLOR = (16, 20, 66)  # Menu mais escuro
 BUTTON_COLOR = (70, 95, 180)
 BUTTON_HOVER_COLOR = (90, 115, 200)
 
-# Carregar fonte personalizada ou usar uma fonte padrão estilizada
-try:
-    font_title = pygame.font.Font("freesansbold.ttf", 74)  # Fonte padrão mais bold
-except:
-    font_title = pygame.font.SysFont('Arial', 74, bold=True)
-
-font_score = pygame.font.SysFont('Arial', 48, bold=True)
-font_menu = pygame.font.SysFont('Arial', 36, bold=True)
-font_debug = pygame.font.SysFont('Consolas', 18)
-
-# --- CLASSES DE CENÁRIO ---
-class Cloud:
-    def __init__(self):
-        self.width = random.randint(80, 160)
-        self.height = random.randint(40, 60)
-        self.x = random.randint(0, SCREEN_WIDTH)
-        self.y = random.randint(50, SCREEN_HEIGHT // 3)
-        self.speed = random.uniform(0.2, 0.5)
-        
-    def move(self):
-        self.x -= self.speed
-        if self.x + self.width < 0:
-            self.x = SCREEN_WIDTH
-            self.y = random.randint(50, SCREEN_HEIGHT // 3)
-
-    def draw(self, surface):
-        # Desenhar uma nuvem simples 2D
-        cloud_color = (180, 180, 200, 100)  # Cor suave com transparência
-        
-        # Base da nuvem
-        cloud_rect = pygame.Rect(self.x, self.y, self.width, self.height)
-        cloud_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        pygame.draw.ellipse(cloud_surface, cloud_color, (0, 0, self.width, self.height))
-        
-        # Detalhes arredondados
-        pygame.draw.ellipse(cloud_surface, cloud_color, 
-                          (self.width * 0.2, -self.height * 0.2, self.width * 0.3, self.height))
-        pygame.draw.ellipse(cloud_surface, cloud_color, 
-                          (self.width * 0.5, -self.height * 0.1, self.width * 0.3, self.height))
-        
-        surface.blit(cloud_surface, cloud_rect)
-
-class Star:
-    def __init__(self):
-        self.x = random.randint(0, SCREEN_WIDTH)
-        self.y = random.randint(0, SCREEN_HEIGHT - 100)
-        self.size = random.randint(1, 3)
-        self.brightness = random.randint(100, 255)
-        self.twinkle_speed = random.uniform(0.02, 0.05)
-        self.time = random.random() * 6.28  # Random start phase
-
-    def update(self):
-        self.time += self.twinkle_speed
-        self.brightness = 155 + int(100 * np.sin(self.time))
-
-    def draw(self, surface):
-        color = (min(255, self.brightness), min(255, self.brightness), min(255, self.brightness))
-        pygame.draw.circle(surface, color, (self.x, self.y), self.size)
-
-# Criar nuvens e estrelas
-clouds = [Cloud() for _ in range(6)]
-stars = [Star() for _ in range(50)]
-
-# --- CARREGAR OU CRIAR ARQUIVO DE HIGH SCORE ---
+# Fontes carregadas no primeiro uso: o título tenta a fonte padrão mais
+# bold e cai para Arial; a de depuração muda de texto a todo quadro e não
+# entra no atlas em disco
+font_title = LazyFont('Arial', 74, bold=True, path="freesansbold.ttf", cache=asset_cache)
+font_score = LazyFont('Arial', 48, bold=True, cache=asset_cache)
+font_menu = LazyFont('Arial', 36, bold=True, cache=asset_cache)
+font_debug = LazyFont('Consolas', 18, cache=asset_cache, persist=False)
+FONTS = (font_title, font_score, font_menu, font_debug)
+
+# Textos que se repetem entre quadros são renderizados uma vez só; os do
+# último uso são salvos ao sair (atlas) e recarregados no próximo início
+text_cache = TextCache()
+render_text = text_cache.render
+TEXT_ATLAS_KEY = [font.key for font in FONTS]
+
+def load_text_atlas():
+    cached = asset_cache.load("textos", TEXT_ATLAS_KEY)
+    if cached is not None:
+        surfaces, entries = cached
+        text_cache.preload(FONTS, entries, surfaces)
+
+def save_text_atlas():
+    entries, surfaces = text_cache.export()
+    asset_cache.store("textos", TEXT_ATLAS_KEY, surfaces, entries)
+
+# --- CENÁRIO ---
+# Estrelas (arrays NumPy, ver cenario.StarField) e camadas de nuvens com
+# paralaxe, do fundo para a frente: (quantidade, velocidade, escala, alfa)
+STAR_COUNT = int(os.environ.get("FLAPPYVOICE_ESTRELAS", "50"))
+CLOUD_LAYERS = ((2, 0.15, 0.6, 60), (2, 0.3, 0.8, 80), (2, 0.5, 1.0, 100))
+starfield = StarField(STAR_COUNT, SCREEN_WIDTH, SCREEN_HEIGHT - 100)
+# Tamanho das nuvens fixo por camada (sprites reaproveitados do cache), posições sorteadas
+cloud_layers = [CloudLayer(count, SCREEN_WIDTH, 50, SCREEN_HEIGHT // 3, speed, scale, alpha,
+                           shape_seed=i, cache=asset_cache)
+                for i, (count, speed, scale, alpha) in enumerate(CLOUD_LAYERS)]
+
+# --- RECORDE E ESTATÍSTICAS ---
+# Gravados em segundo plano (ver persistencia.ScoreStore): o banco SQLite
+# guarda cada partida e o ranking; highscore.json espelha o recorde
 HIGHSCORE_FILE = "highscore.json"
-def load_highscore():
-    try:
-        with open(HIGHSCORE_FILE, 'r') as f:
-            return json.load(f)['highscore']
-    except:
-        return 0
-
-def save_highscore(score):
-    with open(HIGHSCORE_FILE, 'w') as f:
-        json.dump({'highscore': score}, f)
-
-highscore = load_highscore()
+STATS_DB = os.environ.get("FLAPPYVOICE_BANCO", "flappyvoice.db")
 
 # --- ESTADOS DO JOGO ---
 MENU = "menu"
 PLAYING = "playing"
 GAME_OVER = "game_over"
-game_state = MENU
 
 # --- CLASSES DE INTERFACE ---
 class Button:
@@ -192,12 +203,13 @@ class Button:
         pygame.draw.rect(surface, WHITE, self.rect, width=2, border_radius=12)
         
         # Texto do botão com sombra
-        text_surface = font_menu.render(self.text, True, WHITE)
-        text_shadow = font_menu.render(self.text, True, BLACK)
+        text_surface = render_text(font_menu, self.text, WHITE)
+        text_shadow = render_text(font_menu, self.text, BLACK)
         text_rect = text_surface.get_rect(center=self.rect.center)
         
         surface.blit(text_shadow, (text_rect.x + 2, text_rect.y + 2))
         surface.blit(text_surface, text_rect)
+        return glow_rect.union(self.rect)
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEMOTION:
@@ -208,348 +220,500 @@ class Button:
         return False
 
 # --- CONFIGURAÇÕES VISUAIS ---
-class ParticleSystem:
-    def __init__(self):
-        self.particles = []
-
-    def create_particle(self, x, y, color):
-        particle = {
-            'x': x,
-            'y': y,
-            'dx': random.uniform(-2, 2),
-            'dy': random.uniform(-2, 2),
-            'lifetime': 30,
-            'color': color,
-            'size': random.randint(2, 4)
-        }
-        self.particles.append(particle)
-
-    def update(self):
-        for particle in self.particles[:]:
-            particle['x'] += particle['dx']
-            particle['y'] += particle['dy']
-            particle['lifetime'] -= 1
-            if particle['lifetime'] <= 0:
-                self.particles.remove(particle)
-
-    def draw(self, surface):
-        for particle in self.particles:
-            alpha = int((particle['lifetime'] / 30) * 255)
-            color = list(particle['color'])
-            if len(color) == 3:
-                color.append(alpha)
-            s = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, color, (particle['size'], particle['size']), particle['size'])
-            surface.blit(s, (int(particle['x'] - particle['size']), int(particle['y'] - particle['size'])))
-
 particle_system = ParticleSystem()
 
 # --- CONFIGURAÇÕES DE ÁUDIO ---
-audio_queue = queue.Queue()
 SAMPLE_RATE = 44100
-BLOCK_SIZE = 2048
-NOISE_THRESHOLD = 0.01
-ANALYSIS_SIZE = BLOCK_SIZE * 2
-audio_accumulator = np.array([], dtype=np.float32)
-fft_data = np.array([]) 
-
-def audio_callback(indata, frames, time_, status):
-    audio_queue.put(indata.copy())
-
-stream = sd.InputStream(channels=1, callback=audio_callback, samplerate=SAMPLE_RATE, blocksize=BLOCK_SIZE)
-stream.start()
-
-
-# --- CONFIGURAÇÕES DO JOGADOR E FÍSICA ---
-player_vy = 0
-GRAVITY = 0.15  # Reduzido para cair mais devagar
-LIFT_FORCE = -1.2  # Reduzido para subir mais suavemente
-VOLUME_SENSITIVITY = 15  # Reduzido para ter mais controle
-MAX_VELOCITY = 5  # Limitar a velocidade máxima
-
-# Atualizar a posição do pássaro para corresponder ao retângulo de colisão
-bird.rect.y = SCREEN_HEIGHT // 2
-
-# --- CONFIGURAÇÕES DOS OBSTÁCULOS E JOGO ---
-obstacles = []
-OBSTACLE_WIDTH = 70
-OBSTACLE_SPEED = 4
-GAP_HEIGHT = 200
-OBSTACLE_FREQUENCY = 2000
-last_obstacle_time = 0
-
-score = 0
-game_over = False
-
-
-def create_obstacle():
-    gap_center_y = random.randint(GAP_HEIGHT, SCREEN_HEIGHT - GAP_HEIGHT)
-    top_rect = pygame.Rect(SCREEN_WIDTH, 0, OBSTACLE_WIDTH, gap_center_y - GAP_HEIGHT // 2)
-    bottom_rect = pygame.Rect(SCREEN_WIDTH, gap_center_y + GAP_HEIGHT // 2, OBSTACLE_WIDTH, SCREEN_HEIGHT)
-    return {'top': top_rect, 'bottom': bottom_rect, 'passed': False}
+BLOCK_SIZE = 512  # Blocos menores chegam a cada ~12 ms (menos que um quadro)
+ANALYSIS_SIZE = 4096  # Janela de análise (~93 ms)
+HOP_SIZE = 512  # Nova análise a cada 512 amostras recebidas
+RING_CAPACITY = SAMPLE_RATE  # 1 segundo de áudio
+STALE_FEATURE_LIMIT = 0.25  # Dados mais velhos que isso (s) são ignorados
+# Bandas do espectrômetro: espaçamento "log" ou "mel" entre f_min e f_max
+BAND_CONFIG = {'n_bands': 96, 'f_min': 60.0, 'f_max': 8000.0, 'scale': "log"}
+# Passa-faixa da voz aplicado a cada bloco antes da análise
+FILTER_CONFIG = {'low_hz': 80.0, 'high_hz': 4000.0}
+# Limiar de voz adaptativo: 'margin' vezes o RMS do ruído medido na
+# calibração (e atualizado continuamente), com subtração espectral
+NOISE_CONFIG = {'margin': 2.0, 'min_gate': 0.003, 'initial_gate': NOISE_THRESHOLD, 'subtract': 1.0}
+CALIBRATION_SECONDS = 2.0  # Medição do ruído no menu (tecla C repete)
+# Controle do pássaro: "volume" (intensidade da voz) ou "tom" (frequência
+# fundamental; faixa e escala em config.py)
+CONTROL_MODE = os.environ.get("FLAPPYVOICE_CONTROLE", "volume")
+# Faixa de busca e limiar do estimador de tom (só usado no modo "tom")
+PITCH_CONFIG = {'f_min': 70.0, 'f_max': 1000.0, 'threshold': 0.15}
+# RMS e FFT rodam fora do loop de renderização: "thread" ou "process"
+DSP_MODE = os.environ.get("FLAPPYVOICE_DSP", "thread")
+# Fonte do áudio: "mic", "arquivo:sessao.wav", "arquivo-rapido:sessao.wav"
+# ou "sintetico:tone|noise|bursts" (ver fontes_audio.py)
+AUDIO_SOURCE = os.environ.get("FLAPPYVOICE_FONTE", "mic")
+# Se definido, grava o áudio da sessão neste arquivo WAV
+RECORD_PATH = os.environ.get("FLAPPYVOICE_GRAVAR")
+# Se definido, registra cada passo (entradas, estado e obstáculos) neste
+# arquivo binário para reprodução exata com registro.py
+LOG_PATH = os.environ.get("FLAPPYVOICE_REGISTRO")
+
+# --- INSTRUMENTAÇÃO ---
+# Painel de tempos por etapa (alternar com F3) e arquivo .csv/.json com o
+# resumo salvo ao sair
+SHOW_HUD = os.environ.get("FLAPPYVOICE_HUD") == "1"
+# Qualidade gráfica: "auto" ajusta pelo tempo de quadro; 0 a 3 fixa o nível
+# (ver agendador.QUALITY_LEVELS)
+QUALITY = os.environ.get("FLAPPYVOICE_QUALIDADE", "auto")
+# "1" envia à janela só as regiões que mudaram (pygame.display.update)
+DIRTY_RECTS = os.environ.get("FLAPPYVOICE_RETANGULOS") == "1"
+PROFILE_PATH = os.environ.get("FLAPPYVOICE_PERFIL")
 
 # --- FUNÇÕES DE DESENHO ---
 def draw_obstacle(surface, rect):
     # Desenhar obstáculo com cor sólida
-    pygame.draw.rect(surface, OBSTACLE_COLOR, rect)
-
-def draw_background():
-    # Desenhar céu gradiente
-    sky_rect = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-    for i in range(SCREEN_HEIGHT):
-        alpha = i / SCREEN_HEIGHT
-        color = (
-            int(BACKGROUND_COLOR[0] * (1 - alpha * 0.3)),
-            int(BACKGROUND_COLOR[1] * (1 - alpha * 0.3)),
-            int(BACKGROUND_COLOR[2] * (1 - alpha * 0.3))
-        )
-        pygame.draw.line(sky_rect, color, (0, i), (SCREEN_WIDTH, i))
-    screen.blit(sky_rect, (0, 0))
-    
-    # Desenhar estrelas
-    for star in stars:
-        star.update()
-        star.draw(screen)
-    
-    # Desenhar nuvens
-    for cloud in clouds:
-        cloud.move()
-        cloud.draw(screen)
-    
-    # Desenhar grama estática
-    grass_height = 50
-    grass_rect = pygame.Rect(0, SCREEN_HEIGHT - grass_height, SCREEN_WIDTH, grass_height)
-    pygame.draw.rect(screen, GRASS_COLOR, grass_rect)
-    
-    # Linha de divisão suave entre grama e céu
-    pygame.draw.line(screen, (44, 159, 44), 
-                    (0, SCREEN_HEIGHT - grass_height),
-                    (SCREEN_WIDTH, SCREEN_HEIGHT - grass_height), 2)
-
-def draw_menu():
-    draw_background()
+    return pygame.draw.rect(surface, OBSTACLE_COLOR, rect)
+
+# Fundo em camadas pré-renderizadas (céu, grama, estrelas e nuvens)
+background = BackgroundRenderer(SCREEN_WIDTH, SCREEN_HEIGHT, BACKGROUND_COLOR, GRASS_COLOR,
+                                starfield, cloud_layers, cache=asset_cache)
+
+def draw_background(surface, animated=True):
+    background.draw(surface, animated)
+
+def draw_score(surface, score, colors=None):
+    # Desenhar pontuação com sombra; com vários jogadores, um número por
+    # jogador na cor do seu pássaro
+    scores = [score] if np.ndim(score) == 0 else list(score)
+    colors = colors or [WHITE] * len(scores)
+    texts = [render_text(font_score, str(int(value)), color) for value, color in zip(scores, colors)]
+    spacing = 40
+    width = sum(text.get_width() for text in texts) + spacing * (len(texts) - 1)
+    x = SCREEN_WIDTH / 2 - width / 2
+    rect = None
+    for value, text in zip(scores, texts):
+        score_shadow = render_text(font_score, str(int(value)), BLACK)
+        shadow_rect = surface.blit(score_shadow, (x + 2, 52))
+        drawn = surface.blit(text, (x, 50)).union(shadow_rect)
+        rect = drawn if rect is None else rect.union(drawn)
+        x += text.get_width() + spacing
+    return rect
+
+# Espectrômetro: bandas suavizadas (ataque/release e pico retido) desenhadas
+# numa única superfície; altura máxima igual à de antes (valor 50 * 3 px)
+SPECTROMETER_HEIGHT = 150
+spectrum_smoother = SpectrumSmoother(BAND_CONFIG['n_bands'])
+spectrum_renderer = SpectrumRenderer(SCREEN_WIDTH - 20, SPECTROMETER_HEIGHT, BAND_CONFIG['n_bands'],
+                                     SPECTROMETER_COLOR, WHITE)
+
+def draw_spectrometer(surface, bands):
+    values = spectrum_smoother.update(bands)
+    spectrometer = spectrum_renderer.render(values, spectrum_smoother.peaks)
+    surface.blit(spectrometer, (10, SCREEN_HEIGHT - SPECTROMETER_HEIGHT))
+    # Só a parte com barras muda (área vazia acima delas é transparente)
+    used = spectrum_renderer.used_height
+    return pygame.Rect(10, SCREEN_HEIGHT - used, spectrometer.get_width(), used)
+
+def draw_menu(surface, highscore, noise_status="", leaderboard=()):
+    # Retorna as áreas que mudam de um quadro para o outro
+    draw_background(surface)
+    rects = []
     
     # Título com efeito de pulso e brilho
     title_text = "FLAPPY VOICE"
-    pulse = (pygame.time.get_ticks() * 0.004) % (2 * np.pi)
+    pulse = (elapsed_ms() * 0.004) % (2 * np.pi)
     scale = 1.0 + np.sin(pulse) * 0.05
     
     # Renderizar título com efeito de gradiente
     for i in range(4, -1, -1):
         color = (255 - i*20, 200 - i*20, 0)
-        title_surface = font_title.render(title_text, True, color)
+        title_surface = render_text(font_title, title_text, color)
         title_rect = title_surface.get_rect()
         title_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//4)
         title_rect = title_rect.inflate(i*2*scale, i*2*scale)
-        screen.blit(title_surface, title_rect)
+        rects.append(surface.blit(title_surface, title_rect))
     
     # High Score com efeito de brilho
     highscore_text = f"High Score: {highscore}"
-    highscore_surface = font_menu.render(highscore_text, True, WHITE)
-    highscore_shadow = font_menu.render(highscore_text, True, BLACK)
+    highscore_surface = render_text(font_menu, highscore_text, WHITE)
+    highscore_shadow = render_text(font_menu, highscore_text, BLACK)
     highscore_rect = highscore_surface.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
     
-    screen.blit(highscore_shadow, (highscore_rect.x + 2, highscore_rect.y + 2))
-    screen.blit(highscore_surface, highscore_rect)
+    surface.blit(highscore_shadow, (highscore_rect.x + 2, highscore_rect.y + 2))
+    # O recorde e o ranking chegam do disco depois dos primeiros quadros
+    rects.append(surface.blit(highscore_surface, highscore_rect).inflate(4, 4))
+
+    # Ranking das melhores partidas, à direita dos botões
+    if leaderboard:
+        x, y = SCREEN_WIDTH - 200, SCREEN_HEIGHT//2 - 30
+        rects.append(surface.blit(render_text(font_debug, "Melhores partidas", WHITE), (x, y)))
+        for line in leaderboard:
+            y += font_debug.get_linesize()
+            rects.append(surface.blit(render_text(font_debug, line, WHITE), (x, y)))
     
     # Botões
-    start_button.draw(screen)
-    quit_button.draw(screen)
+    rects.append(start_button.draw(surface))
+    rects.append(quit_button.draw(surface))
     
     # Instruções com efeito de fade
-    alpha = (np.sin(pygame.time.get_ticks() * 0.003) + 1) * 0.5 * 255
-    instructions = font_debug.render("Use sua voz para controlar a altura do pássaro!", True, WHITE)
-    instructions_surface = pygame.Surface(instructions.get_size(), pygame.SRCALPHA)
-    instructions_surface.fill((255, 255, 255, int(alpha)))
+    alpha = (np.sin(elapsed_ms() * 0.003) + 1) * 0.5 * 255
+    instructions = render_text(font_debug, "Use sua voz para controlar a altura do pássaro!", WHITE)
+    # A superfície vem do cache: o alfa é redefinido a cada quadro antes do blit
     instructions.set_alpha(int(alpha))
-    screen.blit(instructions, (SCREEN_WIDTH//2 - instructions.get_width()//2, SCREEN_HEIGHT - 50))
+    rects.append(surface.blit(instructions, (SCREEN_WIDTH//2 - instructions.get_width()//2, SCREEN_HEIGHT - 50)))
 
-def draw_game_over():
+    # Estado da calibração do ruído
+    if noise_status:
+        status = render_text(font_debug, noise_status, WHITE)
+        rects.append(surface.blit(status, (SCREEN_WIDTH//2 - status.get_width()//2, SCREEN_HEIGHT - 80)))
+    return rects
+
+def draw_game_over(surface, score, highscore, scores=None):
     overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
     overlay.fill((0, 0, 0, 128))
-    screen.blit(overlay, (0, 0))
+    surface.blit(overlay, (0, 0))
     
     # Game Over com efeito de pulso
-    pulse = (pygame.time.get_ticks() * 0.004) % (2 * np.pi)
+    pulse = (elapsed_ms() * 0.004) % (2 * np.pi)
     scale = 1.0 + np.sin(pulse) * 0.05
     
-    game_over_text = font_title.render("FIM DE JOGO", True, WHITE)
+    game_over_text = render_text(font_title, "FIM DE JOGO", WHITE)
     game_over_rect = game_over_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 100))
     game_over_rect = game_over_rect.inflate(10*scale, 10*scale)
-    screen.blit(game_over_text, game_over_rect)
+    # Só o título pulsa; o resto é igual em todos os quadros
+    pulsing_rect = surface.blit(game_over_text, game_over_rect)
     
-    score_text = font_score.render(f"Pontuação: {score}", True, WHITE)
-    highscore_text = font_menu.render(f"Recorde: {highscore}", True, WHITE)
-    restart_text = font_debug.render("Pressione ESPAÇO para reiniciar", True, WHITE)
+    score_text = render_text(font_score, f"Pontuação: {score}", WHITE)
+    if scores is not None and len(scores) > 1:
+        # Multijogador: vencedor (ou empate) e placar de todos
+        leaders = np.flatnonzero(np.asarray(scores) == score)
+        if len(leaders) == 1:
+            score_text = render_text(font_score, f"Jogador {leaders[0] + 1} venceu: {score}",
+                                     PLAYER_COLORS[leaders[0]])
+        else:
+            score_text = render_text(font_score, f"Empate: {score}", WHITE)
+        board = render_text(font_debug, "   ".join(f"J{i + 1}: {int(s)}" for i, s in enumerate(scores)), WHITE)
+        surface.blit(board, (SCREEN_WIDTH//2 - board.get_width()//2, SCREEN_HEIGHT//2 + 130))
+    highscore_text = render_text(font_menu, f"Recorde: {highscore}", WHITE)
+    restart_text = render_text(font_debug, "Pressione ESPAÇO para reiniciar", WHITE)
     
-    screen.blit(score_text, (SCREEN_WIDTH//2 - score_text.get_width()//2, SCREEN_HEIGHT//2))
-    screen.blit(highscore_text, (SCREEN_WIDTH//2 - highscore_text.get_width()//2, SCREEN_HEIGHT//2 + 50))
-    screen.blit(restart_text, (SCREEN_WIDTH//2 - restart_text.get_width()//2, SCREEN_HEIGHT//2 + 100))
+    surface.blit(score_text, (SCREEN_WIDTH//2 - score_text.get_width()//2, SCREEN_HEIGHT//2))
+    surface.blit(highscore_text, (SCREEN_WIDTH//2 - highscore_text.get_width()//2, SCREEN_HEIGHT//2 + 50))
+    surface.blit(restart_text, (SCREEN_WIDTH//2 - restart_text.get_width()//2, SCREEN_HEIGHT//2 + 100))
+    return pulsing_rect
 
 # Criação dos botões do menu
 start_button = Button(SCREEN_WIDTH//2 - 100, SCREEN_HEIGHT//2, 200, 50, "JOGAR")
 quit_button = Button(SCREEN_WIDTH//2 - 100, SCREEN_HEIGHT//2 + 70, 200, 50, "SAIR")
 
-# --- LOOP PRINCIPAL DO JOGO ---
-rms = 0
-fft_data_for_viz = np.array([])
-
-running = True
-while running:
-    # 1. TRATAR EVENTOS
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-            
-        if game_state == MENU:
-            if start_button.handle_event(event):
-                game_state = PLAYING
-                score = 0
-                obstacles = []
-                bird.rect.y = SCREEN_HEIGHT // 2
-                player_vy = 0
-            elif quit_button.handle_event(event):
-                running = False
-                
-        elif game_state == GAME_OVER:
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
-                game_state = PLAYING
-                score = 0
-                obstacles = []
-                bird.rect.y = SCREEN_HEIGHT // 2
-                player_vy = 0
-
-    # 2. PROCESSAR ÁUDIO
-    rms = 0
-    while not audio_queue.empty():
-        audio_data = audio_queue.get_nowait()
-        audio_accumulator = np.concatenate((audio_accumulator, audio_data.flatten()))
-
-    if len(audio_accumulator) >= ANALYSIS_SIZE:
-        analysis_block = audio_accumulator[:ANALYSIS_SIZE]
-        audio_accumulator = audio_accumulator[ANALYSIS_SIZE:]
-        
-        # Calcular FFT para visualização
-        fft_values = np.abs(np.fft.rfft(analysis_block))
-        fft_values = np.log10(fft_values + 1) * 10
-        fft_data = np.clip(fft_values, 0, 50)
-        
-        rms = np.sqrt(np.mean(analysis_block**2))
+# --- LINHA DE COMANDO ---
+# Os padrões vêm das variáveis de ambiente FLAPPYVOICE_* acima
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Flappy Voice: controle o pássaro com a voz")
+    parser.add_argument("--jogadores", type=int, default=PLAYERS, help="Número de jogadores (1 a 8)")
+    parser.add_argument("--controle", default=CONTROL_MODE, choices=("volume", CONTROL_PITCH))
+    parser.add_argument("--fonte", default=AUDIO_SOURCE, help="mic, arquivo:X.wav, sintetico:tone...")
+    parser.add_argument("--dsp", default=DSP_MODE, choices=("thread", "process"))
+    parser.add_argument("--qualidade", default=QUALITY, help="auto ou um nível de 0 a 3")
+    parser.add_argument("--retangulos", action="store_true", default=DIRTY_RECTS,
+                        help="Atualizar só as regiões da janela que mudaram")
+    parser.add_argument("--gravar", default=RECORD_PATH, help="Gravar o áudio da sessão (WAV)")
+    parser.add_argument("--registro", default=LOG_PATH, help="Registrar cada passo para registro.py")
+    parser.add_argument("--banco", default=STATS_DB, help="Banco SQLite com o ranking e as estatísticas")
+    parser.add_argument("--perfil", default=PROFILE_PATH, help="Salvar os tempos em .csv ou .json")
+    parser.add_argument("--hud", action="store_true", default=SHOW_HUD, help="Painel de tempos (F3)")
+    parser.add_argument("--sem-cache", action="store_true",
+                        help="Gerar todos os recursos sem ler nem gravar o cache em disco")
+    parser.add_argument("--tempos-inicio", action="store_true",
+                        help="Mostrar o tempo de cada etapa da inicialização")
+    return parser.parse_args(argv)
 
-    if game_state == PLAYING:
-        # 3. ATUALIZAR FÍSICA DO JOGADOR
-        # Aplicar gravidade com suavização
-        player_vy += GRAVITY
-        
-        # Controle de voz com suavização
-        if rms > NOISE_THRESHOLD:
-            # Calcular força de elevação com base no volume
-            lift = LIFT_FORCE - (rms * VOLUME_SENSITIVITY)
-            # Aplicar suavização ao movimento
-            lift = lift * 0.7  # Suavizar a força
-            player_vy += lift
-            
-            # Adicionar partículas quando o jogador sobe
-            for _ in range(3):
-                particle_system.create_particle(
-                    bird.rect.centerx - 10,
-                    bird.rect.centery + 10,
-                    (*PLAYER_COLOR, 255)
-                )
-        
-        # Limitar a velocidade máxima
-        player_vy = max(-MAX_VELOCITY, min(MAX_VELOCITY, player_vy))
-        
-        # Aplicar movimento com amortecimento
-        bird.rect.y += player_vy
-        
-        # Atualizar animação do pássaro
-        bird.update(player_vy)
-
-        if bird.rect.top < 0:
-            bird.rect.top = 0
-            player_vy = 0
-        if bird.rect.bottom > SCREEN_HEIGHT:
-            bird.rect.bottom = SCREEN_HEIGHT
-            player_vy = 0
-
-        # 4. GERAR E MOVER OBSTÁCULOS
-        current_time = pygame.time.get_ticks()
-        if current_time - last_obstacle_time > OBSTACLE_FREQUENCY:
-            obstacles.append(create_obstacle())
-            last_obstacle_time = current_time
-
-        for obstacle in obstacles:
-            obstacle['top'].x -= OBSTACLE_SPEED
-            obstacle['bottom'].x -= OBSTACLE_SPEED
-
-        obstacles = [obs for obs in obstacles if obs['top'].right > 0]
-        
-        # 5. VERIFICAR COLISÃO E PONTUAÇÃO
-        for obstacle in obstacles:
-            if bird.rect.colliderect(obstacle['top']) or bird.rect.colliderect(obstacle['bottom']):
-                game_state = GAME_OVER
-                if score > highscore:
-                    highscore = score
-                    save_highscore(highscore)
-            
-            if not obstacle['passed'] and obstacle['top'].centerx < bird.rect.centerx:
-                obstacle['passed'] = True
-                score += 1
-                # Adicionar partículas quando pontua
-                for _ in range(10):
-                    particle_system.create_particle(
-                        bird.rect.centerx,
-                        bird.rect.centery,
-                        SPECTROMETER_COLOR
+# --- LOOP PRINCIPAL DO JOGO ---
+def main(argv=None):
+    args = parse_args(argv)
+    players = args.jogadores
+    control_mode = args.controle
+    startup = StartupTimer(IMPORT_START)
+    startup.add("importação", IMPORT_MS)
+    asset_cache.enabled = not args.sem_cache
+
+    # Só o vídeo: fontes abrem no primeiro texto e o áudio depois do
+    # primeiro quadro
+    with startup.stage("janela"):
+        pygame.display.init()
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Flappy Voice")
+    with startup.stage("atlas de textos"):
+        load_text_atlas()
+    with startup.stage("pássaros"):
+        birds = create_birds(players)
+    # Recorde, ranking e estatísticas: leitura e escrita na thread do ScoreStore
+    with startup.stage("recorde"):
+        store = ScoreStore(args.banco, HIGHSCORE_FILE)
+        store.start()
+
+    clock = pygame.time.Clock()
+    profiler = FrameProfiler()
+    show_hud = args.hud
+    # Física em passos fixos de 1/TICK_RATE s, independente dos quadros
+    scheduler = FixedStepScheduler(TICK_RATE)
+    quality = QualityGovernor(1000 / TICK_RATE, level=0 if args.qualidade == "auto" else int(args.qualidade),
+                              adaptive=args.qualidade == "auto")
+    # Áreas desenhadas por cada elemento, para atualizar só o que mudou
+    tracker = DirtyRectTracker(SCREEN_WIDTH, SCREEN_HEIGHT, enabled=args.retangulos)
+    dirty = tracker.mark
+    last_screen = None
+
+    # Áudio: o callback só entrega os blocos ao trabalhador DSP, com o
+    # instante de captura (ADC) para medir a latência do microfone à tela.
+    # Aberto em start_audio(), depois que o primeiro quadro já apareceu;
+    # até lá o jogo lê um quadro de análise vazio
+    source = recorder = dsp = None
+    idle_features = FeatureFrame(ANALYSIS_SIZE // 2 + 1, BAND_CONFIG['n_bands'], players)
+
+    def audio_callback(indata, frames, time_, status):
+        dsp.push(indata, capture_time(time_, frames, source.sample_rate))
+
+    def start_audio():
+        nonlocal source, recorder, dsp
+        source = open_source(args.fonte, audio_callback, SAMPLE_RATE, BLOCK_SIZE, channels=players)
+        if source.channels < players:
+            raise ValueError(f"A fonte de áudio tem {source.channels} canal(is) para {players} jogadores")
+        if args.gravar:
+            recorder = SessionRecorder(args.gravar, source.sample_rate, source.channels)
+            recorder.start()
+            source.callback = recorder.wrap(audio_callback)
+
+        dsp = DSPWorker(args.dsp, ANALYSIS_SIZE, HOP_SIZE, RING_CAPACITY, channels=source.channels,
+                        sample_rate=source.sample_rate, band_config=BAND_CONFIG,
+                        pitch_config=PITCH_CONFIG if control_mode == CONTROL_PITCH else None,
+                        noise_config=NOISE_CONFIG, filter_config=FILTER_CONFIG)
+        dsp.start()
+        dsp.calibrate(CALIBRATION_SECONDS)
+        source.start()
+
+    # Estado do jogo: física, obstáculos e pontuação de todos os jogadores
+    # ficam na simulação, em arrays
+    sim = MultiplayerSimulation(players, control=control_mode)
+    game_state = MENU
+    last_feature_count = 0
+    silence = np.zeros(players)
+    stats = GameStats(players)
+    session_log = None
+    if args.registro:
+        session_log = SessionLog(args.registro, players, BAND_CONFIG['n_bands'], control_mode, sim.params)
+
+    def start_game():
+        # Semente explícita: a partida pode ser reproduzida a partir do registro
+        seed = int.from_bytes(os.urandom(4), 'little')
+        sim.reset(seed)
+        stats.reset(seed)
+        if session_log is not None:
+            session_log.start_game(seed)
+        for player in birds:
+            player.rect.y = SCREEN_HEIGHT // 2
+        scheduler.reset()
+        return PLAYING
+
+    previous_y = sim.y.copy()
+    running = True
+    while running:
+        frame_start = time.perf_counter()
+
+        # 1. TRATAR EVENTOS
+        with profiler.stage("eventos"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    show_hud = not show_hud
+                    
+                if game_state == MENU:
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_c and dsp is not None:
+                        dsp.calibrate(CALIBRATION_SECONDS)
+                    if start_button.handle_event(event):
+                        game_state = start_game()
+                    elif quit_button.handle_event(event):
+                        running = False
+                        
+                elif game_state == GAME_OVER:
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                        game_state = start_game()
+
+        # 2. LER ÁUDIO
+        # O trabalhador DSP publica RMS e FFT; aqui só lemos o quadro mais
+        # recente. Se o microfone parou de entregar blocos, ignorar o volume.
+        with profiler.stage("audio"):
+            features = dsp.latest() if dsp is not None else idle_features
+            band_data = features.bands
+            fresh = features.age() < STALE_FEATURE_LIMIT
+            # Um valor por jogador (canal), já calculados em lote pelo DSP
+            rms = features.channel_rms[:players] if fresh else silence
+            pitch_hz = features.channel_pitch_hz[:players] if fresh else silence
+            if features.gate > 0:
+                # Limiar adaptativo de cada canal medido pelo trabalhador DSP
+                sim.thresholds[:] = features.channel_gate[:players]
+        new_features = features.count != last_feature_count
+        if new_features:
+            profiler.record("fft/rms", features.analysis_time * 1000)
+
+        # 3. AVANÇAR A SIMULAÇÃO em passos fixos: um quadro lento executa
+        # vários passos, então a dificuldade não depende da taxa de quadros
+        settings = quality.settings
+        for _ in range(scheduler.advance()):
+            if game_state == PLAYING:
+                previous_y[:] = sim.y
+                with profiler.stage("fisica"):
+                    lifted = sim.step_player(rms, pitch_hz,
+                                             features.channel_pitch_confidence[:players])
+
+                    # Atualizar posição e animação dos pássaros
+                    for player, y, vy in zip(birds, sim.y.tolist(), sim.vy.tolist()):
+                        player.rect.y = y
+                        player.update(vy)
+
+                with profiler.stage("obstaculos"):
+                    scoring = sim.alive.copy()
+                    points, collided = sim.step_obstacles()
+                stats.add(scoring, sim.last_rms, sim.thresholds)
+                for i in np.flatnonzero(collided):
+                    # Em qual cano cada um bateu (estatísticas)
+                    stats.death(i, sim.obstacles.hit_detail(BIRD_X, BIRD_X + BIRD_SIZE,
+                                                            sim.y[i], sim.y[i] + BIRD_SIZE))
+                if session_log is not None:
+                    session_log.record(sim, lifted, points, features.age(), band_data)
+
+                for i in np.flatnonzero(lifted):
+                    # Adicionar partículas quando o jogador sobe
+                    player = birds[i]
+                    particle_system.emit(
+                        player.rect.centerx - 10,
+                        player.rect.centery + 10,
+                        (*player.color, 255),
+                        round(3 * settings['particles'])
                     )
+                if points:
+                    # Adicionar partículas quando pontua
+                    for i in np.flatnonzero(scoring):
+                        particle_system.emit(
+                            birds[i].rect.centerx,
+                            birds[i].rect.centery,
+                            SPECTROMETER_COLOR,
+                            round(10 * settings['particles']) * points
+                        )
+                if collided.any() and not sim.alive.any():
+                    # Fim de jogo quando todos bateram
+                    game_state = GAME_OVER
+                    # Só enfileira: a gravação é feita pela thread do ScoreStore
+                    store.submit(stats.seed, players, control_mode, stats.started_at,
+                                 stats.results(sim.score))
+
+            # Atualizar sistema de partículas e animação do fundo
+            with profiler.stage("particulas"):
+                particle_system.update()
+            background.update()
+
+        # Posições desenhadas entre o passo anterior e o atual
+        alpha = scheduler.alpha if game_state == PLAYING else 1.0
+        drawn_y = np.round(previous_y + (sim.y - previous_y) * alpha).astype(int).tolist()
+        obstacle_offset = round(sim.params['OBSTACLE_SPEED'] * (1 - alpha))
+
+        # Renderização
+        # Trocar de tela ou de nível de qualidade redesenha a janela inteira
+        if (game_state, settings['name'], show_hud) != last_screen:
+            tracker.invalidate()
+            last_screen = (game_state, settings['name'], show_hud)
+        if settings['animated_background']:
+            dirty("fundo", background.animated_rects())
 
-    # Atualizar sistema de partículas
-    particle_system.update()
-
-    # Renderização
-    if game_state == MENU:
-        draw_menu()
-    else:
-        draw_background()
-        
-        # Desenhar obstáculos
-        for obstacle in obstacles:
-            draw_obstacle(screen, obstacle['top'])
-            draw_obstacle(screen, obstacle['bottom'])
-        
-        # Desenhar o pássaro
-        bird.draw(screen)
-        
-        # Desenhar sistema de partículas
-        particle_system.draw(screen)
-
-        # Desenhar pontuação com sombra
-        score_text = font_score.render(str(score), True, WHITE)
-        score_shadow = font_score.render(str(score), True, BLACK)
-        score_pos = (SCREEN_WIDTH / 2 - score_text.get_width() / 2, 50)
-        screen.blit(score_shadow, (score_pos[0] + 2, score_pos[1] + 2))
-        screen.blit(score_text, score_pos)
-
-        # Desenhar o espectrômetro com efeito de suavização
-        bar_width = 4
-        for i, value in enumerate(fft_data[::5]):
-            bar_x = 10 + i * bar_width
-            bar_height = value * 3
+        if game_state == MENU:
+            with profiler.stage("desenho menu"):
+                if features.calibrating or not features.count:
+                    noise_status = "Calibrando o ruído... fique em silêncio"
+                else:
+                    noise_status = f"Ruído {features.noise_rms:.4f}  limiar {features.gate:.4f}  (C recalibra)"
+                dirty("menu", draw_menu(screen, store.highscore, noise_status,
+                                           leaderboard_lines(store)))
+        else:
+            with profiler.stage("desenho fundo"):
+                draw_background(screen, settings['animated_background'])
             
-            rect_to_draw = (bar_x, int(SCREEN_HEIGHT - bar_height), bar_width, int(bar_height))
-            pygame.draw.rect(screen, (*SPECTROMETER_COLOR, 200), rect_to_draw)
+            # Desenhar obstáculos
+            with profiler.stage("desenho canos"):
+                for key, top, bottom in sim.obstacles.rects(obstacle_offset):
+                    tracker.mark_solid((key, 'top'), draw_obstacle(screen, top))
+                    tracker.mark_solid((key, 'bottom'), draw_obstacle(screen, bottom))
             
-            # Adicionar brilho no topo das barras
-            glow_rect = (bar_x, int(SCREEN_HEIGHT - bar_height), bar_width, 5)
-            pygame.draw.rect(screen, WHITE, glow_rect)
-
-        if game_state == GAME_OVER:
-            draw_game_over()
-
-    pygame.display.flip()
-    clock.tick(60)
-
-stream.stop()
-stream.close()
-pygame.quit()
+            # Desenhar o pássaro
+            with profiler.stage("desenho passaro"):
+                # Quem já bateu some até o fim da partida
+                for i, player in enumerate(birds):
+                    if sim.alive[i] or game_state == GAME_OVER:
+                        center = (player.rect.centerx, drawn_y[i] + BIRD_SIZE // 2)
+                        dirty(("passaro", i), player.draw(screen, center))
+            
+            # Desenhar sistema de partículas
+            with profiler.stage("desenho partic"):
+                particle_system.draw(screen)
+                dirty("particulas", particle_system.bounds())
+
+            with profiler.stage("desenho placar"):
+                if players == 1:
+                    dirty("placar", draw_score(screen, int(sim.score[0])))
+                else:
+                    dirty("placar", draw_score(screen, sim.score, [b.color for b in birds]))
+
+            if settings['spectrometer']:
+                with profiler.stage("desenho espectro"):
+                    dirty("espectro", draw_spectrometer(screen, band_data))
+
+            if game_state == GAME_OVER:
+                with profiler.stage("desenho fim"):
+                    dirty("fim", draw_game_over(screen, int(sim.score.max()), store.highscore,
+                                                sim.score if players > 1 else None))
+
+        # Painel de desempenho (F3)
+        if show_hud:
+            dirty("painel", profiler.draw_overlay(screen, font_debug))
+            quality_text = render_text(font_debug, f"qualidade: {settings['name']}", WHITE)
+            screen.blit(quality_text, (SCREEN_WIDTH - quality_text.get_width() - 10, 10))
+
+        with profiler.stage("flip"):
+            updated = tracker.present()
+        if dsp is None:
+            # A janela já mostra o menu: agora abrir o áudio
+            startup.add("primeiro quadro", (time.perf_counter() - frame_start) * 1000)
+            with startup.stage("áudio"):
+                start_audio()
+            if args.tempos_inicio or show_hud:
+                print("Inicialização:\n" + startup.report())
+        if args.retangulos:
+            # Fração da tela enviada à janela (em %, não em ms)
+            profiler.record("area %", updated * 100)
+
+        # Latência do microfone à tela: da captura da amostra mais recente
+        # até o primeiro quadro exibido com o resultado da sua análise
+        if new_features:
+            profiler.record("mic->tela", (time.perf_counter() - features.capture_time) * 1000)
+            last_feature_count = features.count
+
+        # Tempo de trabalho do quadro (sem a espera) ajusta a qualidade
+        quality.observe((time.perf_counter() - frame_start) * 1000)
+        clock.tick(TICK_RATE)
+        profiler.end_frame()
+
+    if source is not None:
+        source.stop()
+        source.close()
+    if recorder is not None:
+        recorder.stop()
+    if session_log is not None:
+        session_log.close()
+    if dsp is not None:
+        dsp.stop()
+    store.close()
+    save_text_atlas()
+    if args.perfil:
+        profiler.export(args.perfil, startup)
+    pygame.quit()
+
+
+IMPORT_MS = (time.perf_counter() - IMPORT_START) * 1000
+
+if __name__ == "__main__":
+    main()
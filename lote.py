@@ -0,0 +1,136 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from simulacao import MultiplayerSimulation
+from config import SCREEN_HEIGHT, TICK_RATE, BIRD_X, BIRD_SIZE
+
+# --- SIMULAÇÃO EM LOTE ---
+# Avança N partidas independentes ao mesmo tempo: é a MultiplayerSimulation
+# (simulacao.py) com N pássaros, a mesma física e o mesmo ObstacleManager.
+# Todos os jogos do lote usam os mesmos parâmetros, então os obstáculos
+# surgem, andam, saem e pontuam juntos (x compartilhado); só a altura das
+# aberturas muda de jogo para jogo. Essas alturas ficam num array (N, K)
+# indexado pela identidade estável do obstáculo (ids % K), sorteadas a cada
+# obstáculo novo com o gerador NumPy do lote.
+class BatchSimulation(MultiplayerSimulation):
+    def __init__(self, n, params=None, seed=None):
+        super().__init__(n, seed, params)
+
+    @property
+    def n(self):
+        return self.players
+
+    def reset(self, seed=None):
+        super().reset(seed)
+        self.gap_rng = np.random.default_rng(seed)
+        # K = capacidade do ObstacleManager: nunca há mais ativos que isso
+        ring = len(self.obstacles.x)
+        self.gap_top = np.zeros((self.players, ring))  # Fim do cano de cima
+        self.gap_bottom = np.zeros((self.players, ring))  # Início do cano de baixo
+
+    def spawn_gaps(self, obstacle_id):
+        gap_height = self.params['GAP_HEIGHT']
+        slot = obstacle_id % self.gap_top.shape[1]
+        gap_center = self.gap_rng.integers(gap_height, SCREEN_HEIGHT - gap_height + 1, self.players)
+        self.gap_top[:, slot] = gap_center - gap_height // 2
+        self.gap_bottom[:, slot] = gap_center + gap_height // 2
+
+    def move_obstacles(self):
+        # Mesmo passo do ObstacleManager; só a colisão usa as aberturas de
+        # cada jogo em vez das do gerenciador
+        obstacles = self.obstacles
+        spawned = obstacles.spawned
+        points = obstacles.advance(BIRD_X + BIRD_SIZE // 2)
+        if obstacles.spawned != spawned:
+            self.spawn_gaps(int(obstacles.ids[obstacles.count - 1]))
+        start, end = obstacles.crossing(BIRD_X, BIRD_X + BIRD_SIZE)
+        if start == end:
+            return points, np.zeros(self.players, dtype=bool)
+        slots = obstacles.ids[start:end] % self.gap_top.shape[1]
+        y = self.y[:, None]
+        hit = ((y < self.gap_top[:, slots]) | (y + BIRD_SIZE > self.gap_bottom[:, slots])).any(axis=1)
+        return points, hit
+
+
+def synthetic_traces(n, ticks, seed=None, mean_gap=40, mean_burst=12, level=0.05):
+    # Versão vetorizada de simulacao.synthetic_features: N sequências de
+    # silêncios e "gritos" com durações aleatórias
+    rng = np.random.default_rng(seed)
+    segments = ticks // min(mean_gap, mean_burst) + 2
+    gaps = rng.exponential(mean_gap, (n, segments)).astype(np.int64)
+    bursts = np.maximum(1, rng.exponential(mean_burst, (n, segments)).astype(np.int64))
+    traces = np.zeros((n, ticks))
+    for i in range(n):
+        durations = np.column_stack((gaps[i], bursts[i])).ravel()
+        voiced = np.repeat(np.arange(len(durations)) % 2 == 1, durations)[:ticks]
+        traces[i, :len(voiced)] = voiced * level * rng.uniform(0.5, 1.5, len(voiced))
+    return traces
+
+
+def param_grid(**values):
+    # param_grid(GRAVITY=[0.1, 0.15], LIFT_FORCE=[-1, -1.2]) -> lista de dicts
+    names = list(values)
+    return [dict(zip(names, combo)) for combo in itertools.product(*values.values())]
+
+
+def summarize(params, result):
+    ticks, score = result['ticks'], result['score']
+    return {
+        'params': params,
+        'games': len(score),
+        'survival_rate': float(result['alive'].mean()),
+        'ticks_mean': float(ticks.mean()),
+        'ticks_p50': float(np.percentile(ticks, 50)),
+        'ticks_p90': float(np.percentile(ticks, 90)),
+        'score_mean': float(score.mean()),
+        'score_p50': float(np.percentile(score, 50)),
+        'score_p90': float(np.percentile(score, 90)),
+        'score_max': int(score.max()),
+        'score_hist': np.bincount(score).tolist(),
+    }
+
+
+def _run_param_set(args):
+    params, traces, seed = args
+    result = BatchSimulation(len(traces), params, seed).run(traces)
+    return summarize(params, result)
+
+
+def run_sweep(param_sets, traces, seed=0, processes=None):
+    # Distribui os conjuntos de parâmetros entre os núcleos; cada processo
+    # roda um lote completo (todas as sequências) para um conjunto
+    traces = np.atleast_2d(np.asarray(traces, dtype=np.float64))
+    tasks = [(params, traces, seed) for params in param_sets]
+    if processes == 1:
+        return [_run_param_set(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(_run_param_set, tasks))
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Varredura de parâmetros da física em lote")
+    parser.add_argument("--traces", help="Arquivo .npy com volumes (N, T); sem ele, usa sequências sintéticas")
+    parser.add_argument("--jogos", type=int, default=1000, help="Partidas sintéticas por conjunto")
+    parser.add_argument("--segundos", type=int, default=120, help="Duração máxima de cada partida")
+    parser.add_argument("--processos", type=int, default=None)
+    parser.add_argument("--saida", help="Salvar o resumo em JSON")
+    args = parser.parse_args()
+
+    if args.traces:
+        traces = np.load(args.traces)
+    else:
+        traces = synthetic_traces(args.jogos, args.segundos * TICK_RATE, seed=0)
+
+    grid = param_grid(GRAVITY=[0.1, 0.15, 0.2], LIFT_FORCE=[-0.8, -1.2, -1.6],
+                      GAP_HEIGHT=[160, 200])
+    results = run_sweep(grid, traces, processes=args.processos)
+    for r in sorted(results, key=lambda r: -r['score_mean']):
+        print(f"{r['params']}  sobrevivência {r['survival_rate']:.1%}  "
+              f"passos p50 {r['ticks_p50']:.0f}  pontos média {r['score_mean']:.2f} "
+              f"p90 {r['score_p90']:.0f} máx {r['score_max']}")
+    if args.saida:
+        with open(args.saida, 'w') as f:
+            json.dump(results, f, indent=2)
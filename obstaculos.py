@@ -0,0 +1,162 @@
+import math
+import numpy as np
+import pygame
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, OBSTACLE_WIDTH
+
+# --- OBSTÁCULOS EM ARRAYS ---
+# Posição x, centro e altura da abertura de cada par de canos ficam em
+# arrays NumPy, com os obstáculos ativos sempre nas primeiras 'count'
+# posições (do mais antigo ao mais novo). Mover todos é uma operação
+# vetorizada; um novo obstáculo surge quando o último já andou 'spacing'
+# pixels, não por tempo. Como todos andam juntos, o array fica ordenado
+# por x: os que saem da tela, os já pontuados e os que ficaram para trás
+# do pássaro são sempre os primeiros, e a colisão só é testada a partir
+# daí, enquanto o obstáculo ainda cruzar a faixa x do pássaro.
+class ObstacleManager:
+    def __init__(self, rng, gap_height, speed, spacing, width=OBSTACLE_WIDTH):
+        self.rng = rng  # random.Random da simulação (mesma sequência de antes)
+        self.gap_height = gap_height
+        self.speed = speed
+        self.whole_speed = float(speed).is_integer()
+        self.spacing = spacing  # Distância entre obstáculos (px)
+        self.width = width
+        capacity = math.ceil((SCREEN_WIDTH + width) / max(spacing, 1)) + 2
+        self.x = np.zeros(capacity)
+        self.gap_center = np.zeros(capacity, dtype=np.int64)
+        self.gap_heights = np.zeros(capacity, dtype=np.int64)
+        self.ids = np.zeros(capacity, dtype=np.int64)  # Identidade estável (desenho)
+        self.count = 0
+        self.passed = 0  # Os 'passed' primeiros já foram pontuados
+        self.behind = 0  # Os 'behind' primeiros já ficaram atrás do pássaro
+        self.bird_left = None
+        self.spawned = 0
+        self.distance_to_spawn = 0.0  # O primeiro surge no primeiro passo
+        # Retângulos reaproveitados a cada desenho, um par por posição
+        self.top_rects = [pygame.Rect(0, 0, 0, 0) for _ in range(capacity)]
+        self.bottom_rects = [pygame.Rect(0, 0, 0, 0) for _ in range(capacity)]
+
+    def __len__(self):
+        return self.count
+
+    def grow(self):
+        capacity = len(self.x) * 2
+        for name in ('x', 'gap_center', 'gap_heights', 'ids'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        self.top_rects += [pygame.Rect(0, 0, 0, 0) for _ in range(capacity - len(self.top_rects))]
+        self.bottom_rects += [pygame.Rect(0, 0, 0, 0) for _ in range(capacity - len(self.bottom_rects))]
+
+    def spawn(self, gap_height=None):
+        gap_height = self.gap_height if gap_height is None else gap_height
+        if self.count == len(self.x):
+            self.grow()
+        i = self.count
+        self.x[i] = SCREEN_WIDTH
+        self.gap_center[i] = self.rng.randint(gap_height, SCREEN_HEIGHT - gap_height)
+        self.gap_heights[i] = gap_height
+        self.ids[i] = self.spawned
+        self.count += 1
+        self.spawned += 1
+
+    def step(self, bird):
+        # Um passo: gerar, mover, descartar, pontuar e testar colisão.
+        # Retorna (pontos ganhos, colidiu)
+        points = self.advance(bird.centerx)
+        start, end = self.crossing(bird.left, bird.right)
+        for i in range(start, end):
+            gap = self.gap_heights[i] // 2
+            if bird.top < self.gap_center[i] - gap or bird.bottom > self.gap_center[i] + gap:
+                return points, True
+        return points, False
+
+    def step_all(self, left, right, tops, bottoms):
+        # Mesmo passo para vários pássaros na mesma faixa x (multijogador):
+        # tops/bottoms são arrays com a borda de cada um. Retorna (pontos
+        # ganhos por quem está vivo, array de colisões)
+        points = self.advance((left + right) // 2)
+        start, end = self.crossing(left, right)
+        if start == end:
+            return points, np.zeros(len(tops), dtype=bool)
+        gap = self.gap_heights[start:end] // 2
+        center = self.gap_center[start:end]
+        hit = ((tops[:, None] < center - gap) | (bottoms[:, None] > center + gap)).any(axis=1)
+        return points, hit
+
+    def advance(self, bird_centerx):
+        # Gerar, mover, descartar e pontuar; retorna os pontos ganhos
+        if self.distance_to_spawn <= 1e-9:
+            self.spawn()
+            self.distance_to_spawn += self.spacing
+        self.distance_to_spawn -= self.speed
+
+        n = self.count
+        x = self.x[:n]
+        if self.whole_speed:
+            x -= self.speed
+        else:
+            # Mesmo arredondamento do pygame.Rect
+            x -= self.speed - 0.5
+            np.floor(x, out=x)
+
+        # Descartar os que saíram pela esquerda (deslocando o array)
+        gone = 0
+        while gone < n and x[gone] + self.width <= 0:
+            gone += 1
+        if gone:
+            keep = n - gone
+            for array in (self.x, self.gap_center, self.gap_heights, self.ids):
+                array[:keep] = array[gone:n].copy()
+            self.count = n = keep
+            self.passed = max(0, self.passed - gone)
+            self.behind = max(0, self.behind - gone)
+            x = self.x[:n]
+
+        # Pontuação: o centro do obstáculo passou do centro do pássaro
+        points = 0
+        center = bird_centerx - self.width // 2
+        while self.passed < n and x[self.passed] < center:
+            self.passed += 1
+            points += 1
+        return points
+
+    def crossing(self, left, right):
+        # Índices [start, end) dos obstáculos que cruzam a faixa x
+        # [left, right) do pássaro
+        if left != self.bird_left:
+            self.bird_left = left
+            self.behind = 0
+        n = self.count
+        x = self.x
+        while self.behind < n and x[self.behind] <= left - self.width:
+            self.behind += 1
+        end = self.behind
+        while end < n and x[end] < right:
+            end += 1
+        return self.behind, end
+
+    def hit_detail(self, left, right, top, bottom):
+        # (id do obstáculo, "cima" ou "baixo") do cano em que um pássaro
+        # bateu, ou None; usado nas estatísticas, não na física
+        start, end = self.crossing(left, right)
+        for i in range(start, end):
+            gap = self.gap_heights[i] // 2
+            if top < self.gap_center[i] - gap:
+                return int(self.ids[i]), "cima"
+            if bottom > self.gap_center[i] + gap:
+                return int(self.ids[i]), "baixo"
+        return None
+
+    def rects(self, offset=0):
+        # (id, cano de cima, cano de baixo) de cada obstáculo ativo, com os
+        # retângulos reaproveitados; 'offset' desloca em x (interpolação)
+        for i in range(self.count):
+            x = int(self.x[i]) + offset
+            gap = int(self.gap_heights[i]) // 2
+            center = int(self.gap_center[i])
+            top = self.top_rects[i]
+            bottom = self.bottom_rects[i]
+            top.update(x, 0, self.width, center - gap)
+            bottom.update(x, center + gap, self.width, SCREEN_HEIGHT)
+            yield int(self.ids[i]), top, bottom
@@ -0,0 +1,120 @@
+import numpy as np
+import pygame
+
+# --- SISTEMA DE PARTÍCULAS EM ARRAYS ---
+# Cada atributo das partículas fica num array NumPy pré-alocado (estrutura
+# de arrays). As partículas vivas ocupam sempre as primeiras 'count'
+# posições, então atualizar e remover as expiradas é uma operação vetorizada.
+# Quando a capacidade acaba, as partículas mais antigas são recicladas.
+X, Y, DX, DY, LIFE = range(5)
+SIZE, COLOR = range(2)
+
+class ParticleSystem:
+    def __init__(self, capacity=2048, lifetime=30, alpha_buckets=16, seed=None):
+        self.capacity = capacity
+        self.lifetime = lifetime
+        self.alpha_buckets = alpha_buckets
+        self.state = np.zeros((5, capacity), dtype=np.float32)  # x, y, dx, dy, vida
+        self.attrs = np.zeros((2, capacity), dtype=np.int16)  # tamanho, índice da cor
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+
+        # Paleta de cores usadas: (r, g, b, alfa fixo ou -1 para desvanecer)
+        self.palette = []
+        self.palette_index = {}
+        # Sprites de círculo pré-renderizados por (tamanho, faixa de alfa, cor)
+        self.sprites = {}
+
+    def __len__(self):
+        return self.count
+
+    def color_id(self, color):
+        if color not in self.palette_index:
+            # Cores com alfa explícito mantêm esse alfa; RGB desvanece com a vida
+            alpha = color[3] if len(color) == 4 else -1
+            self.palette_index[color] = len(self.palette)
+            self.palette.append((color[0], color[1], color[2], alpha))
+        return self.palette_index[color]
+
+    def reserve(self, n):
+        # Libera espaço descartando as partículas mais antigas (início do array)
+        n = min(n, self.capacity)
+        overflow = self.count + n - self.capacity
+        if overflow > 0:
+            keep = self.count - overflow
+            self.state[:, :keep] = self.state[:, overflow:self.count].copy()
+            self.attrs[:, :keep] = self.attrs[:, overflow:self.count].copy()
+            self.count = keep
+        return n
+
+    def emit(self, x, y, color, n):
+        n = self.reserve(n)
+        start, end = self.count, self.count + n
+        self.state[X, start:end] = x
+        self.state[Y, start:end] = y
+        self.state[DX:DY + 1, start:end] = self.rng.uniform(-2, 2, (2, n))
+        self.state[LIFE, start:end] = self.lifetime
+        self.attrs[SIZE, start:end] = self.rng.integers(2, 5, n)
+        self.attrs[COLOR, start:end] = self.color_id(color)
+        self.count = end
+
+    def create_particle(self, x, y, color):
+        self.emit(x, y, color, 1)
+
+    def update(self):
+        n = self.count
+        if n == 0:
+            return
+        state = self.state[:, :n]
+        state[X] += state[DX]
+        state[Y] += state[DY]
+        state[LIFE] -= 1
+
+        # Remover as expiradas compactando as vivas no início dos arrays
+        alive = state[LIFE] > 0
+        if not alive.all():
+            index = np.flatnonzero(alive)
+            k = len(index)
+            self.state[:, :k] = state[:, index]
+            self.attrs[:, :k] = self.attrs[:, index]
+            self.count = k
+
+    def sprite(self, size, bucket, color_id):
+        key = (size, bucket, color_id)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            r, g, b, alpha = self.palette[color_id]
+            if alpha < 0:
+                alpha = min(255, (bucket + 1) * 256 // self.alpha_buckets)
+            sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (r, g, b, alpha), (size, size), size)
+            self.sprites[key] = sprite
+        return sprite
+
+    def draw(self, surface):
+        n = self.count
+        if n == 0:
+            return
+        sizes = self.attrs[SIZE, :n]
+        colors = self.attrs[COLOR, :n]
+        # Faixa de alfa proporcional à vida restante
+        buckets = (self.state[LIFE, :n] * self.alpha_buckets / (self.lifetime + 1)).astype(np.int16)
+        xs = (self.state[X, :n] - sizes).astype(np.int32)
+        ys = (self.state[Y, :n] - sizes).astype(np.int32)
+
+        sprite = self.sprite
+        surface.blits([(sprite(s, b, c), (x, y)) for s, b, c, x, y in
+                       zip(sizes.tolist(), buckets.tolist(), colors.tolist(), xs.tolist(), ys.tolist())],
+                      doreturn=False)
+
+    def bounds(self):
+        # Retângulo que contém todas as partículas vivas (None se não houver)
+        n = self.count
+        if n == 0:
+            return None
+        size = int(self.attrs[SIZE, :n].max())
+        left = int(self.state[X, :n].min()) - size - 1
+        top = int(self.state[Y, :n].min()) - size - 1
+        right = int(self.state[X, :n].max()) + size + 1
+        bottom = int(self.state[Y, :n].max()) + size + 1
+        return pygame.Rect(left, top, right - left, bottom - top)
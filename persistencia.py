@@ -0,0 +1,252 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import numpy as np
+from config import TICK_RATE
+
+# --- RECORDE E ESTATÍSTICAS EM SEGUNDO PLANO ---
+# O loop do jogo só entrega o resultado de cada partida a uma fila; uma
+# thread escreve tudo num banco SQLite (uma transação por lote) e espelha o
+# recorde em highscore.json com escrita atômica (temporário + os.replace),
+# então um travamento nunca deixa um arquivo pela metade. O banco tem
+# índice pela pontuação: o ranking do menu é uma consulta, sem ler arquivos.
+# A leitura inicial também é feita pela thread; até ela terminar, o jogo
+# vê recorde 0 e ranking vazio.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,  -- time.time() do início da partida
+    seed INTEGER,
+    players INTEGER NOT NULL,
+    control TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    game INTEGER NOT NULL REFERENCES games(id),
+    player INTEGER NOT NULL,  -- 0 a 7 (canal de áudio)
+    score INTEGER NOT NULL,
+    ticks INTEGER NOT NULL,  -- Passos sobrevividos
+    duration REAL NOT NULL,  -- Segundos de jogo
+    rms_mean REAL NOT NULL,  -- RMS médio enquanto vivo
+    voiced REAL NOT NULL,  -- Fração dos passos com voz acima do limiar
+    death_obstacle INTEGER,  -- Número do obstáculo (0 = primeiro) em que bateu
+    death_side TEXT  -- "cima" ou "baixo"
+);
+CREATE INDEX IF NOT EXISTS results_score ON results (score DESC, duration DESC);
+CREATE INDEX IF NOT EXISTS results_death ON results (death_obstacle);
+"""
+
+
+def write_atomic(path, data):
+    # Grava num temporário no mesmo diretório, força ao disco e renomeia
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'w') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+def read_legacy_highscore(path):
+    # Recorde de highscore.json; None se não existe, -1 se está corrompido
+    try:
+        with open(path) as f:
+            return int(json.load(f)['highscore'])
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError):
+        return -1
+
+
+class GameStats:
+    # Acumula, passo a passo, os números de uma partida de cada jogador
+    def __init__(self, players):
+        self.players = players
+        self.reset()
+
+    def reset(self, seed=None):
+        n = self.players
+        self.seed = seed
+        self.started_at = time.time()
+        self.rms_sum = np.zeros(n)
+        self.voiced = np.zeros(n, dtype=np.int64)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.deaths = [None] * n  # (obstáculo, lado) de quem bateu
+
+    def add(self, alive, rms, thresholds):
+        # 'alive': quem estava vivo no início do passo
+        self.rms_sum += np.where(alive, rms, 0.0)
+        self.voiced += alive & (rms > thresholds)
+        self.ticks += alive
+
+    def death(self, player, detail):
+        self.deaths[player] = detail
+
+    def results(self, score):
+        rows = []
+        for i in range(self.players):
+            ticks = int(self.ticks[i])
+            obstacle, side = self.deaths[i] or (None, None)
+            rows.append({'player': i, 'score': int(score[i]), 'ticks': ticks,
+                         'duration': ticks / TICK_RATE,
+                         'rms_mean': float(self.rms_sum[i] / ticks) if ticks else 0.0,
+                         'voiced': float(self.voiced[i] / ticks) if ticks else 0.0,
+                         'death_obstacle': obstacle, 'death_side': side})
+        return rows
+
+
+class ScoreStore:
+    def __init__(self, path="flappyvoice.db", highscore_path="highscore.json", top=5):
+        self.path = path
+        self.highscore_path = highscore_path
+        self.top = top
+        self.queue = queue.Queue()
+        self.loaded = threading.Event()
+        self.stored_highscore = 0  # Maior pontuação já gravada (thread de escrita)
+        self.session_highscore = 0  # Maior desta execução (loop do jogo)
+        self.leaderboard = ()  # (pontos, jogador, duração, início) dos 'top' melhores
+        self.version = 0  # Muda a cada atualização do ranking
+        self.errors = 0
+        self._thread = None
+
+    @property
+    def highscore(self):
+        return max(self.stored_highscore, self.session_highscore)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, seed, players, control, started_at, rows):
+        # Chamado no fim da partida: só enfileira (sem E/S no loop do jogo)
+        best = max(row['score'] for row in rows)
+        self.session_highscore = max(self.session_highscore, best)
+        self.queue.put((seed, players, control, started_at, rows))
+
+    def close(self, timeout=5.0):
+        # Grava o que ainda estiver na fila e encerra a thread
+        if self._thread is not None:
+            self.queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _open(self):
+        try:
+            connection = sqlite3.connect(self.path)
+            connection.executescript(SCHEMA)
+            return connection
+        except sqlite3.OperationalError as e:
+            # Sem permissão, disco cheio...: o jogo segue, sem guardar
+            print(f"Não foi possível abrir {self.path} ({e}); estatísticas só nesta execução")
+        except sqlite3.DatabaseError as e:
+            # Arquivo que não é um banco: guardado à parte e recomeçado do zero
+            print(f"Banco {self.path} ilegível ({e}); movido para {self.path}.corrompido")
+            try:
+                os.replace(self.path, f"{self.path}.corrompido")
+                connection = sqlite3.connect(self.path)
+                connection.executescript(SCHEMA)
+                return connection
+            except (OSError, sqlite3.Error):
+                pass
+        connection = sqlite3.connect(":memory:")
+        connection.executescript(SCHEMA)
+        return connection
+
+    def _refresh(self, connection):
+        best = connection.execute("SELECT MAX(score) FROM results").fetchone()[0] or 0
+        self.leaderboard = tuple(connection.execute(
+            "SELECT r.score, r.player, r.duration, g.started_at FROM results r "
+            "JOIN games g ON g.id = r.game ORDER BY r.score DESC, r.duration DESC LIMIT ?",
+            (self.top,)).fetchall())
+        self.stored_highscore = max(self.stored_highscore, best)
+        self.version += 1
+
+    def _write_highscore(self):
+        try:
+            write_atomic(self.highscore_path, json.dumps({'highscore': self.stored_highscore}))
+        except OSError as e:
+            self.errors += 1
+            print(f"Não foi possível salvar {self.highscore_path}: {e}")
+
+    def _store(self, connection, batch):
+        with connection:  # Uma transação para o lote inteiro
+            for seed, players, control, started_at, rows in batch:
+                game = connection.execute(
+                    "INSERT INTO games (started_at, seed, players, control) VALUES (?, ?, ?, ?)",
+                    (started_at, seed, players, control)).lastrowid
+                connection.executemany(
+                    "INSERT INTO results VALUES (:game, :player, :score, :ticks, :duration, "
+                    ":rms_mean, :voiced, :death_obstacle, :death_side)",
+                    [dict(row, game=game) for row in rows])
+
+    def _run(self):
+        connection = self._open()
+        # Recorde antigo: highscore.json (anterior ao banco) ou o do banco
+        legacy = read_legacy_highscore(self.highscore_path)
+        if legacy == -1:
+            print(f"{self.highscore_path} corrompido; recorde restaurado do banco")
+        self.stored_highscore = max(legacy or 0, 0)
+        self._refresh(connection)
+        if legacy != self.stored_highscore and (legacy is not None or self.stored_highscore):
+            self._write_highscore()
+        self.loaded.set()
+
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                running = False
+                batch = [item for item in batch if item is not None]
+            if not batch:
+                continue
+            previous = self.stored_highscore
+            try:
+                self._store(connection, batch)
+            except sqlite3.Error as e:
+                self.errors += 1
+                print(f"Não foi possível salvar as estatísticas em {self.path}: {e}")
+            self._refresh(connection)
+            # A partida pode ter batido o recorde mesmo se o banco falhou
+            best = max(row['score'] for *_, rows in batch for row in rows)
+            self.stored_highscore = max(self.stored_highscore, best)
+            if self.stored_highscore > previous:
+                self._write_highscore()
+        connection.close()
+
+
+def leaderboard_lines(store):
+    # Texto do ranking do menu, uma linha por posição
+    return [f"{i + 1}. {score:>3}  J{player + 1}  {int(duration) // 60}:{int(duration) % 60:02d}"
+            for i, (score, player, duration, _) in enumerate(store.leaderboard)]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ranking e estatísticas das partidas do Flappy Voice")
+    parser.add_argument("banco", nargs="?", default="flappyvoice.db")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    connection = sqlite3.connect(args.banco)
+    connection.executescript(SCHEMA)
+    games, seconds = connection.execute(
+        "SELECT COUNT(DISTINCT game), COALESCE(SUM(duration), 0) FROM results").fetchone()
+    print(f"{games} partida(s), {seconds / 60:.1f} min de jogo")
+    for i, (score, player, duration, rms, started_at) in enumerate(connection.execute(
+            "SELECT r.score, r.player, r.duration, r.rms_mean, g.started_at FROM results r "
+            "JOIN games g ON g.id = r.game ORDER BY r.score DESC, r.duration DESC LIMIT ?", (args.top,))):
+        print(f"{i + 1:>3}. {score:>4} pontos  jogador {player + 1}  {duration:6.1f} s  "
+              f"rms médio {rms:.4f}  {time.strftime('%Y-%m-%d %H:%M', time.localtime(started_at))}")
+    print("Batidas por obstáculo (número do obstáculo: cima / baixo):")
+    for obstacle, top, bottom in connection.execute(
+            "SELECT death_obstacle, SUM(death_side = 'cima'), SUM(death_side = 'baixo') FROM results "
+            "WHERE death_obstacle IS NOT NULL GROUP BY death_obstacle ORDER BY death_obstacle LIMIT 20"):
+        print(f"  {obstacle:>3}: {top} / {bottom}")
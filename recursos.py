@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import pygame
+
+# --- CACHE DE RECURSOS EM DISCO ---
+# Sprites gerados por código (pássaro e suas rotações, gradiente do céu,
+# nuvens, textos da interface) e o caminho das fontes do sistema são
+# guardados em disco na primeira execução e recarregados nas seguintes.
+# A chave de cada item inclui CACHE_VERSION, a versão do pygame e os
+# parâmetros que o geraram (tamanho, cor, passo...); mudou algo, o nome do
+# arquivo muda e o item é gerado de novo. Superfícies vão num .spr sem
+# compressão (pixels RGBA/RGB concatenados) e valores simples num .json.
+# Falhas de leitura ou escrita nunca impedem o jogo: o item só é refeito.
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.environ.get(
+    "FLAPPYVOICE_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "flappyvoice"))
+
+
+class AssetCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, enabled=True):
+        self.directory = directory
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, name, key, extension):
+        digest = hashlib.sha1(repr((CACHE_VERSION, pygame.version.ver, key)).encode()).hexdigest()
+        return os.path.join(self.directory, f"{name}-{digest[:16]}{extension}")
+
+    def write(self, path, save):
+        # Grava num temporário e renomeia: um arquivo pela metade nunca é lido
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, 'wb') as f:
+                save(f)
+            os.replace(temporary, path)
+        except OSError:
+            pass
+
+    def load(self, name, key):
+        # (superfícies, info) guardados em disco, ou None
+        if not self.enabled:
+            return None
+        try:
+            surfaces, info = load_surfaces(self.path(name, key, ".spr"))
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return surfaces, info
+
+    def store(self, name, key, surfaces, info=None):
+        # 'info' é qualquer valor serializável em JSON guardado junto
+        if self.enabled:
+            self.write(self.path(name, key, ".spr"), lambda f: save_surfaces(f, surfaces, info))
+
+    def surfaces(self, name, key, build):
+        # Lista de superfícies de 'build()', ou as mesmas lidas do disco
+        cached = self.load(name, key)
+        if cached is not None:
+            return cached[0]
+        surfaces = build()
+        self.store(name, key, surfaces)
+        return surfaces
+
+    def value(self, name, key, build):
+        # Valor serializável em JSON (ex.: caminho de uma fonte)
+        path = self.path(name, key, ".json")
+        if self.enabled:
+            try:
+                with open(path) as f:
+                    value = json.load(f)
+                self.hits += 1
+                return value
+            except (OSError, ValueError):
+                pass
+        self.misses += 1
+        value = build()
+        if self.enabled:
+            self.write(path, lambda f: f.write(json.dumps(value).encode()))
+        return value
+
+
+# Formato: assinatura, tamanho do cabeçalho JSON (4 bytes), cabeçalho
+# (largura, altura, alfa e início de cada superfície, mais 'info') e os
+# pixels concatenados. Ler é um único read(), e as superfícies usam fatias
+# desse buffer direto (pygame.image.frombuffer, sem cópia).
+SURFACES_MAGIC = b"FVSPR001"
+# Mesma ordem de bytes das superfícies com alfa do pygame (máscara R em
+# 0xFF0000): lidas em "RGBA", o blit fica várias vezes mais lento
+PIXEL_FORMAT = "BGRA"
+
+
+def save_surfaces(f, surfaces, info=None):
+    layout = []
+    chunks = []
+    offset = 0
+    for surface in surfaces:
+        alpha = bool(surface.get_flags() & pygame.SRCALPHA)
+        data = pygame.image.tobytes(surface, PIXEL_FORMAT if alpha else "RGB")
+        layout.append((*surface.get_size(), alpha, offset))
+        chunks.append(data)
+        offset += len(data)
+    header = json.dumps({'layout': layout, 'info': info}).encode()
+    f.write(SURFACES_MAGIC + len(header).to_bytes(4, 'little') + header)
+    for data in chunks:
+        f.write(data)
+
+
+def load_surfaces(path):
+    with open(path, 'rb') as f:
+        # bytearray: as superfícies apontam para este buffer e podem ser alteradas
+        data = bytearray(os.fstat(f.fileno()).st_size)
+        f.readinto(data)
+    data = memoryview(data)
+    if bytes(data[:8]) != SURFACES_MAGIC:
+        raise ValueError(f"{path} não é um arquivo de sprites do cache")
+    size = int.from_bytes(data[8:12], 'little')
+    header = json.loads(bytes(data[12:12 + size]))
+    pixels = data[12 + size:]
+    surfaces = []
+    for width, height, alpha, offset in header['layout']:
+        length = width * height * (4 if alpha else 3)
+        if offset + length > len(pixels):
+            raise ValueError(f"{path} incompleto")
+        surfaces.append(pygame.image.frombuffer(pixels[offset:offset + length], (width, height),
+                                                PIXEL_FORMAT if alpha else "RGB"))
+    return surfaces, header['info']
+
+
+# --- FONTES SOB DEMANDA ---
+# pygame.font.SysFont varre as fontes instaladas (fc-list no Linux) na
+# primeira chamada, o que pode levar centenas de milissegundos. LazyFont só
+# carrega a fonte no primeiro uso, e o arquivo encontrado para (nome,
+# negrito) fica no cache: nas execuções seguintes a fonte abre direto pelo
+# caminho, sem a varredura. 'path' aponta um arquivo a tentar antes.
+class LazyFont:
+    def __init__(self, name, size, bold=False, path=None, cache=None, persist=True):
+        self.name = name
+        self.size = size
+        self.bold = bold
+        self.path = path
+        self.cache = cache
+        self.persist = persist  # Textos desta fonte entram no atlas em disco
+        self.key = (name, size, bold, path)
+        self._font = None
+
+    def load(self):
+        if self._font is not None:
+            return self._font
+        if not pygame.font.get_init():
+            pygame.font.init()
+        if self.path is not None:
+            try:
+                self._font = pygame.font.Font(self.path, self.size)
+                return self._font
+            except (OSError, pygame.error):
+                pass
+        if self.cache is None:
+            self._font = pygame.font.SysFont(self.name, self.size, bold=self.bold)
+            return self._font
+
+        def locate():
+            # Arquivo escolhido pelo SysFont e se o negrito é sintético
+            font = pygame.font.SysFont(self.name, self.size, bold=self.bold)
+            return {'path': pygame.font.match_font(self.name, bold=self.bold),
+                    'fake_bold': font.get_bold()}
+
+        found = self.cache.value("fonte", (self.name, self.bold), locate)
+        try:
+            self._font = pygame.font.Font(found['path'], self.size)
+        except (OSError, pygame.error):
+            self._font = pygame.font.SysFont(self.name, self.size, bold=self.bold)
+            return self._font
+        if found['fake_bold']:
+            self._font.set_bold(True)
+        return self._font
+
+    def __getattr__(self, attribute):
+        # render, size, get_linesize... vão para a fonte carregada
+        return getattr(self.load(), attribute)
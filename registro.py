@@ -0,0 +1,265 @@
+import json
+import os
+import time
+import numpy as np
+from config import TICK_RATE
+from simulacao import MultiplayerSimulation
+
+# --- REGISTRO BINÁRIO DA SESSÃO ---
+# Cabeçalho de tamanho fixo (assinatura + JSON com jogadores, modo de
+# controle, parâmetros da física e número de bandas) seguido de um registro
+# de tamanho fixo por passo da simulação. O arquivo só cresce no fim, então
+# uma sessão interrompida continua legível, e a leitura é um np.memmap.
+# Cada registro guarda as entradas da física com precisão total (RMS, tom,
+# confiança e limiar de cada jogador), a semente da partida, o obstáculo
+# gerado no passo e o estado resultante (y, vy, pontos), que a reprodução
+# usa para confirmar que chegou exatamente ao mesmo lugar.
+MAGIC = b"FVLOG001"
+HEADER_SIZE = 4096
+BAND_SCALE = 5  # Bandas (0 a 50 dB) guardadas como uint8 com passo de 0,2 dB
+
+
+def record_dtype(players, n_bands):
+    return np.dtype([
+        ('game', '<u4'),  # Partida dentro do arquivo (0, 1, ...)
+        ('seed', '<u8'),
+        ('tick', '<u4'),
+        ('time', '<f8'),  # time.perf_counter do passo
+        ('feature_age', '<f4'),  # Idade do quadro de áudio usado (s)
+        ('rms', '<f8', (players,)),
+        ('pitch_hz', '<f8', (players,)),
+        ('confidence', '<f8', (players,)),
+        ('threshold', '<f8', (players,)),
+        ('y', '<i2', (players,)),  # Topo do pássaro depois do passo
+        ('vy', '<f4', (players,)),
+        ('score', '<u2', (players,)),
+        ('alive', 'u1', (players,)),
+        ('lifted', 'u1', (players,)),
+        ('points', 'u1'),
+        ('spawn_gap', '<i2'),  # Centro da abertura gerada no passo (-1: nenhuma)
+        ('bands', 'u1', (n_bands,)),  # Resumo do espectro exibido
+    ])
+
+
+class SessionLog:
+    def __init__(self, path, players, n_bands, control, params, flush_every=256):
+        self.path = path
+        self.meta = {'version': 1, 'players': players, 'n_bands': n_bands, 'control': control,
+                     'tick_rate': TICK_RATE, 'params': dict(params)}
+        self.dtype = record_dtype(players, n_bands)
+        header = MAGIC + json.dumps(self.meta).encode()
+        if len(header) > HEADER_SIZE:
+            raise ValueError("Cabeçalho do registro maior que HEADER_SIZE")
+        self.file = open(path, 'wb')
+        self.file.write(header.ljust(HEADER_SIZE, b'\0'))
+        # Registros acumulados num bloco e gravados juntos (poucos KB por
+        # escrita, a cada ~4 s de jogo a 60 passos/s)
+        self.buffer = np.zeros(flush_every, dtype=self.dtype)
+        self.pending = 0
+        self.records = 0
+        self.game = -1
+        self.spawned = 0
+
+    def start_game(self, seed):
+        self.game += 1
+        self.spawned = 0
+
+    def record(self, sim, lifted, points, feature_age=0.0, bands=None):
+        # Chamado depois de cada passo completo da simulação
+        buffer, i = self.buffer, self.pending
+        obstacles = sim.obstacles
+        buffer['game'][i] = self.game
+        buffer['seed'][i] = sim.seed
+        buffer['tick'][i] = sim.tick - 1
+        buffer['time'][i] = time.perf_counter()
+        buffer['feature_age'][i] = min(feature_age, 1e9)
+        buffer['rms'][i] = sim.last_rms
+        buffer['pitch_hz'][i] = sim.last_pitch_hz
+        buffer['confidence'][i] = sim.last_confidence
+        buffer['threshold'][i] = sim.thresholds
+        buffer['y'][i] = sim.y
+        buffer['vy'][i] = sim.vy
+        buffer['score'][i] = sim.score
+        buffer['alive'][i] = sim.alive
+        buffer['lifted'][i] = lifted
+        buffer['points'][i] = points
+        spawn_gap = -1
+        if obstacles.spawned != self.spawned:
+            # O mais novo é sempre o último do array
+            spawn_gap = int(obstacles.gap_center[obstacles.count - 1])
+            self.spawned = obstacles.spawned
+        buffer['spawn_gap'][i] = spawn_gap
+        if bands is not None:
+            np.multiply(bands, BAND_SCALE, out=buffer['bands'][i], casting='unsafe')
+        self.pending += 1
+        if self.pending == len(buffer):
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.file.write(self.buffer[:self.pending].tobytes())
+            self.file.flush()
+            self.records += self.pending
+            self.pending = 0
+
+    def close(self):
+        if self.file is not None:
+            self.flush()
+            self.file.close()
+            self.file = None
+
+
+def open_log(path):
+    # Retorna (metadados, registros como np.memmap somente leitura). Um
+    # registro final incompleto (sessão interrompida) é ignorado
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+    if not header.startswith(MAGIC):
+        raise ValueError(f"{path} não é um registro de sessão do Flappy Voice")
+    meta = json.loads(header[len(MAGIC):].rstrip(b'\0'))
+    dtype = record_dtype(meta['players'], meta['n_bands'])
+    count = (os.path.getsize(path) - HEADER_SIZE) // dtype.itemsize
+    if count == 0:
+        return meta, np.zeros(0, dtype=dtype)
+    return meta, np.memmap(path, dtype=dtype, mode='r', offset=HEADER_SIZE, shape=(count,))
+
+
+def game_records(records, game):
+    # Registros de uma partida (cópia contígua)
+    return records[records['game'] == game]
+
+
+def replay_game(meta, records, step_callback=None):
+    # Reproduz uma partida com as entradas registradas e confere o estado
+    # passo a passo. Retorna o passo da primeira divergência (None se a
+    # reprodução foi exata) e a simulação no estado final
+    sim = MultiplayerSimulation(meta['players'], int(records['seed'][0]), meta['params'],
+                                meta['control'])
+    rms, pitch_hz, confidence = records['rms'], records['pitch_hz'], records['confidence']
+    thresholds, y, score = records['threshold'], records['y'], records['score']
+    for i in range(len(records)):
+        sim.thresholds[:] = thresholds[i]
+        lifted, points, collided = sim.step(rms[i], pitch_hz[i], confidence[i])
+        if step_callback is not None and step_callback(sim, records[i]) is False:
+            break
+        if (sim.y != y[i]).any() or (sim.score != score[i]).any():
+            return i, sim
+    return None, sim
+
+
+def summarize_game(records):
+    # Números para investigar "o pássaro não reagiu": quanto tempo a voz
+    # passou do limiar, quanto ficou logo abaixo dele e se o áudio chegou
+    # atrasado (quadros velhos são ignorados pelo jogo)
+    rms, threshold = records['rms'], records['threshold']
+    return {
+        'ticks': len(records),
+        'seconds': len(records) / TICK_RATE,
+        'score': records['score'][-1].tolist(),
+        'voiced': (rms > threshold).mean(axis=0).round(3).tolist(),
+        'just_below': ((rms > threshold * 0.5) & (rms <= threshold)).mean(axis=0).round(3).tolist(),
+        'rms_max': rms.max(axis=0).round(4).tolist(),
+        'threshold_mean': threshold.mean(axis=0).round(4).tolist(),
+        'lifted': records['lifted'].mean(axis=0).round(3).tolist(),
+        'stale_ticks': int((records['feature_age'] >= 0.25).sum()),
+        'feature_age_p95_ms': round(float(np.percentile(records['feature_age'], 95)) * 1000, 1),
+        'obstacles': int((records['spawn_gap'] >= 0).sum()),
+    }
+
+
+def play_game(meta, records, speed=1.0):
+    # Reprodução com janela, no ritmo do jogo (speed=2 dobra a velocidade).
+    # Espaço pausa, Esc sai
+    import pygame
+    import jogo
+
+    pygame.display.init()
+    screen = pygame.display.set_mode((jogo.SCREEN_WIDTH, jogo.SCREEN_HEIGHT))
+    pygame.display.set_caption("Flappy Voice - reprodução")
+    clock = pygame.time.Clock()
+    birds = jogo.create_birds(meta['players'])
+    bands = np.zeros(meta['n_bands'], dtype=np.float32)
+    state = {'paused': False}
+
+    def draw(sim, record):
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN
+                                                 and event.key == pygame.K_ESCAPE):
+                    return False
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                    state['paused'] = not state['paused']
+            if not state['paused']:
+                break
+            clock.tick(TICK_RATE)
+
+        for player, y, vy in zip(birds, sim.y.tolist(), sim.vy.tolist()):
+            player.rect.y = y
+            player.update(vy)
+        jogo.background.update()
+        jogo.draw_background(screen)
+        for _, top, bottom in sim.obstacles.rects():
+            jogo.draw_obstacle(screen, top)
+            jogo.draw_obstacle(screen, bottom)
+        for i, player in enumerate(birds):
+            if sim.alive[i]:
+                player.draw(screen)
+        jogo.draw_score(screen, sim.score if len(birds) > 1 else int(sim.score[0]),
+                        [b.color for b in birds] if len(birds) > 1 else None)
+        np.divide(record['bands'], BAND_SCALE, out=bands)
+        jogo.draw_spectrometer(screen, bands)
+        info = (f"partida {record['game']}  passo {record['tick']}  "
+                f"rms {record['rms'][0]:.4f}  limiar {record['threshold'][0]:.4f}  "
+                f"áudio {record['feature_age'] * 1000:.0f} ms")
+        screen.blit(jogo.font_debug.render(info, True, jogo.WHITE), (10, 10))
+        pygame.display.flip()
+        clock.tick(TICK_RATE * speed)
+        return True
+
+    result = replay_game(meta, records, draw)
+    pygame.quit()
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Reproduz um registro de sessão do Flappy Voice")
+    parser.add_argument("registro", help="Arquivo gravado com FLAPPYVOICE_REGISTRO")
+    parser.add_argument("--partida", type=int, help="Só esta partida (padrão: todas)")
+    parser.add_argument("--janela", action="store_true",
+                        help="Mostrar a reprodução no ritmo do jogo (padrão: sem janela, o mais rápido possível)")
+    parser.add_argument("--velocidade", type=float, default=1.0, help="Multiplicador do ritmo com --janela")
+    parser.add_argument("--saida", help="Salvar o resumo das partidas em JSON")
+    args = parser.parse_args()
+
+    meta, records = open_log(args.registro)
+    games = np.unique(records['game']).tolist() if args.partida is None else [args.partida]
+    print(f"{len(records)} passos, {len(games)} partida(s), {meta['players']} jogador(es), "
+          f"controle {meta['control']}, {records.dtype.itemsize} bytes por passo")
+    summaries = []
+    for game in games:
+        selected = game_records(records, game)
+        if not len(selected):
+            print(f"Partida {game}: sem registros")
+            continue
+        start = time.perf_counter()
+        if args.janela:
+            diverged, sim = play_game(meta, selected, args.velocidade)
+        else:
+            diverged, sim = replay_game(meta, selected)
+        elapsed = time.perf_counter() - start
+        summary = summarize_game(selected)
+        summary.update(game=game, seed=int(selected['seed'][0]), diverged_at=diverged)
+        summaries.append(summary)
+        status = "exata" if diverged is None else f"DIVERGIU no passo {diverged}"
+        print(f"Partida {game}: {summary['ticks']} passos ({summary['seconds']:.1f} s), "
+              f"pontos {summary['score']}, reprodução {status} em {elapsed:.2f} s "
+              f"({summary['ticks'] / TICK_RATE / max(elapsed, 1e-9):.0f}x o tempo real)")
+        print(f"  voz acima do limiar {summary['voiced']}, logo abaixo {summary['just_below']}, "
+              f"subidas {summary['lifted']}")
+        print(f"  rms máx {summary['rms_max']}, limiar médio {summary['threshold_mean']}, "
+              f"áudio velho em {summary['stale_ticks']} passos (p95 {summary['feature_age_p95_ms']} ms)")
+    if args.saida:
+        with open(args.saida, 'w') as f:
+            json.dump({'meta': meta, 'games': summaries}, f, indent=2)
@@ -0,0 +1,221 @@
+import random
+import numpy as np
+import pygame  # Apenas pygame.Rect: a simulação não abre janela nem microfone
+from tom import pitch_to_height
+from obstaculos import ObstacleManager
+from config import SCREEN_HEIGHT, TICK_RATE, BIRD_X, BIRD_SIZE, DEFAULT_PARAMS
+
+# Eventos produzidos por um passo da simulação
+EVENT_LIFT = "lift"  # A voz passou do limiar e o pássaro subiu
+EVENT_SCORE = "score"  # Passou por um obstáculo
+EVENT_COLLISION = "collision"  # Bateu num obstáculo
+
+# Modos de controle: intensidade da voz ou frequência fundamental
+CONTROL_VOLUME = "volume"
+CONTROL_PITCH = "tom"
+
+# --- SIMULAÇÃO DO JOGO SEM JANELA ---
+# Física do pássaro, geração de obstáculos e colisão avançam em passos fixos
+# (um passo = 1/TICK_RATE s) com um gerador aleatório próprio, então a
+# mesma semente e a mesma sequência de volumes reproduzem a mesma partida.
+# A renderização (jogo.py) é só uma camada por cima deste estado.
+# São N pássaros (multijogador local, um por canal de áudio) no mesmo
+# percurso: posição, velocidade, vivo e pontos ficam em arrays, e colisão e
+# pontuação de todos saem de uma única consulta aos obstáculos (os pássaros
+# estão na mesma faixa x, então cruzam os mesmos canos e pontuam juntos).
+# Quem bate fica parado; a partida acaba quando todos bateram.
+class MultiplayerSimulation:
+    def __init__(self, players, seed=None, params=None, control=CONTROL_VOLUME):
+        if control not in (CONTROL_VOLUME, CONTROL_PITCH):
+            raise ValueError(f"Modo de controle desconhecido: {control}")
+        self.players = players
+        self.control = control
+        self.params = dict(DEFAULT_PARAMS)
+        if params:
+            self.params.update(params)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        n = self.players
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.y = np.full(n, SCREEN_HEIGHT // 2, dtype=np.float64)  # Topo de cada pássaro
+        self.vy = np.zeros(n)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.alive = np.ones(n, dtype=bool)
+        self.ticks = np.zeros(n, dtype=np.int64)  # Passos sobrevividos
+        self.tick = 0
+        # Limiar de voz de cada canal (o jogo usa o limiar adaptativo)
+        self.thresholds = np.full(n, float(self.params['NOISE_THRESHOLD']))
+        # Entradas do último passo (para o registro de sessão)
+        self.last_rms = np.zeros(n)
+        self.last_pitch_hz = np.zeros(n)
+        self.last_confidence = np.zeros(n)
+        self.obstacle_interval = round(self.params['OBSTACLE_FREQUENCY'] * TICK_RATE / 1000)
+        speed = self.params['OBSTACLE_SPEED']
+        self.obstacles = ObstacleManager(self.rng, self.params['GAP_HEIGHT'], speed,
+                                         speed * (self.obstacle_interval + 1))
+
+    def step(self, rms, pitch_hz=0.0, confidence=0.0):
+        # Um passo com o RMS (e o tom) de cada canal; retorna (quem subiu,
+        # pontos ganhos, quem bateu)
+        lifted = self.step_player(rms, pitch_hz, confidence)
+        points, collided = self.step_obstacles()
+        return lifted, points, collided
+
+    def step_player(self, rms, pitch_hz=0.0, confidence=0.0):
+        # Física de todos os pássaros; retorna o array de quem subiu
+        p = self.params
+        self.last_rms[:] = rms
+        self.last_pitch_hz[:] = pitch_hz
+        self.last_confidence[:] = confidence
+        rms = self.last_rms
+        voiced = rms > self.thresholds
+
+        if self.control == CONTROL_PITCH:
+            pitch_hz = self.last_pitch_hz
+            voiced &= (pitch_hz > 0) & (self.last_confidence >= p['PITCH_CONFIDENCE'])
+            # Seguir a altura correspondente à frequência (a gravidade só
+            # vale para quem não está cantando)
+            fraction = pitch_to_height(np.where(voiced, pitch_hz, p['PITCH_MIN_HZ']),
+                                       p['PITCH_MIN_HZ'], p['PITCH_MAX_HZ'], p['PITCH_SCALE'])
+            target_y = SCREEN_HEIGHT - BIRD_SIZE / 2 - fraction * (SCREEN_HEIGHT - BIRD_SIZE)
+            follow = (target_y - (self.y + BIRD_SIZE // 2)) * p['PITCH_FOLLOW']
+            vy = np.where(voiced, follow, self.vy + p['GRAVITY'])
+            lifted = voiced & (follow < 0)
+        else:
+            vy = self.vy + p['GRAVITY']
+            lift = (p['LIFT_FORCE'] - rms * p['VOLUME_SENSITIVITY']) * 0.7
+            np.add(vy, lift, out=vy, where=voiced)
+            lifted = voiced
+
+        # Só ufuncs com 'out' (np.clip e índices booleanos custam mais que a
+        # conta inteira com poucos pássaros)
+        np.minimum(vy, p['MAX_VELOCITY'], out=vy)
+        np.maximum(vy, -p['MAX_VELOCITY'], out=vy)
+        # Mesmo arredondamento do pygame.Rect (y é sempre positivo)
+        y = self.y + vy
+        y += 0.5
+        np.floor(y, out=y)
+        floor = SCREEN_HEIGHT - BIRD_SIZE
+        edge = (y < 0) | (y > floor)
+        np.maximum(y, 0, out=y)
+        np.minimum(y, floor, out=y)
+        # Quem já bateu fica parado; quem encostou na borda para
+        alive = self.alive
+        self.y = np.where(alive, y, self.y)
+        self.vy = np.where(alive, np.where(edge, 0.0, vy), self.vy)
+        return lifted & alive
+
+    def step_obstacles(self):
+        # Obstáculos, colisão e pontuação de todos (encerra o passo).
+        # Retorna (pontos ganhos por cada vivo, array de quem bateu agora)
+        points, hit = self.move_obstacles()
+        alive = self.alive
+        collided = hit & alive
+        if points:
+            self.score += alive * points
+        self.ticks += alive
+        self.alive = alive & ~hit
+        self.tick += 1
+        return points, collided
+
+    def move_obstacles(self):
+        # Gerar, mover e testar os obstáculos contra a posição atual de
+        # todos; retorna (pontos ganhos, array de colisões)
+        return self.obstacles.step_all(BIRD_X, BIRD_X + BIRD_SIZE, self.y, self.y + BIRD_SIZE)
+
+    def run(self, traces, max_ticks=None):
+        # traces: RMS com forma (jogadores, T) ou (T,) para todos
+        traces = np.asarray(traces, dtype=np.float64)
+        total = traces.shape[-1] if max_ticks is None else min(max_ticks, traces.shape[-1])
+        for t in range(total):
+            if not self.alive.any():
+                break
+            self.step(traces[..., t])
+        return {'seed': self.seed, 'ticks': self.ticks, 'score': self.score, 'alive': self.alive}
+
+
+# --- UM JOGADOR ---
+# A mesma simulação com um pássaro só, com a interface escalar (Rect do
+# pássaro, vy, pontos e vivo como números, eventos por passo) usada pelas
+# ferramentas sem janela. Não tem física própria: tudo é delegado a
+# MultiplayerSimulation(1), então as duas nunca divergem.
+class GameSimulation:
+    def __init__(self, seed=None, params=None, control=CONTROL_VOLUME):
+        self.sim = MultiplayerSimulation(1, seed, params, control)
+        self.bird_rect = pygame.Rect(BIRD_X, SCREEN_HEIGHT // 2, BIRD_SIZE, BIRD_SIZE)
+
+    params = property(lambda self: self.sim.params)
+    control = property(lambda self: self.sim.control)
+    seed = property(lambda self: self.sim.seed)
+    tick = property(lambda self: self.sim.tick)
+    obstacles = property(lambda self: self.sim.obstacles)
+    vy = property(lambda self: float(self.sim.vy[0]))
+    score = property(lambda self: int(self.sim.score[0]))
+    alive = property(lambda self: bool(self.sim.alive[0]))
+
+    def reset(self, seed=None):
+        self.sim.reset(seed)
+        self.bird_rect.y = int(self.sim.y[0])
+
+    def step(self, rms, pitch_hz=0.0, confidence=0.0):
+        # Avança um passo com o volume (RMS) atual e, no modo tom, a
+        # frequência estimada e sua confiança; retorna a lista de eventos
+        events = self.step_player(rms, pitch_hz, confidence)
+        events += self.step_obstacles()
+        return events
+
+    def step_player(self, rms, pitch_hz=0.0, confidence=0.0):
+        # Física do pássaro (primeira metade de um passo)
+        lifted = self.sim.step_player(rms, pitch_hz, confidence)
+        self.bird_rect.y = int(self.sim.y[0])
+        return [EVENT_LIFT] if lifted[0] else []
+
+    def step_obstacles(self):
+        # Obstáculos, colisão e pontuação (segunda metade de um passo,
+        # que encerra o passo)
+        scoring = self.alive
+        points, collided = self.sim.step_obstacles()
+        events = [EVENT_COLLISION] if collided[0] else []
+        if scoring:
+            events += [EVENT_SCORE] * points
+        return events
+
+    def run(self, features, max_ticks=None):
+        # Roda sem janela até o pássaro bater, a sequência de volumes acabar
+        # ou 'max_ticks' passos. Aceita números (RMS) ou quadros com .rms
+        # (e .pitch_hz/.pitch_confidence no modo tom)
+        for frame in features:
+            if not self.alive or (max_ticks is not None and self.tick >= max_ticks):
+                break
+            self.step(getattr(frame, 'rms', frame), getattr(frame, 'pitch_hz', 0.0),
+                      getattr(frame, 'pitch_confidence', 0.0))
+        return {'seed': self.seed, 'ticks': self.tick, 'score': self.score, 'alive': self.alive}
+
+
+def synthetic_features(seed=None, mean_gap=40, mean_burst=12, level=0.05):
+    # Sequência infinita de volumes: silêncios e "gritos" alternados com
+    # durações aleatórias, para testes sem microfone
+    rng = random.Random(seed)
+    while True:
+        for _ in range(int(rng.expovariate(1 / mean_gap))):
+            yield 0.0
+        for _ in range(max(1, int(rng.expovariate(1 / mean_burst)))):
+            yield level * rng.uniform(0.5, 1.5)
+
+
+if __name__ == "__main__":
+    import time
+
+    # Roda várias partidas sem janela e mostra a velocidade da simulação
+    sessions = 1000
+    start = time.perf_counter()
+    results = [GameSimulation(seed).run(synthetic_features(seed), max_ticks=TICK_RATE * 120)
+               for seed in range(sessions)]
+    elapsed = time.perf_counter() - start
+    ticks = sum(r['ticks'] for r in results)
+    print(f"{sessions} partidas, {ticks} passos em {elapsed:.2f} s "
+          f"({ticks / TICK_RATE / elapsed:.0f}x o tempo real)")
+    print(f"Pontuação média: {sum(r['score'] for r in results) / sessions:.2f}, "
+          f"máxima: {max(r['score'] for r in results)}")
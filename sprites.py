@@ -0,0 +1,129 @@
+from collections import OrderedDict
+import pygame
+
+# --- CACHE DE SPRITES ROTACIONADOS ---
+# O ângulo do pássaro fica limitado a [min_angle, max_angle], então cada
+# frame de animação pode ser rotacionado antecipadamente em ângulos
+# quantizados ('step' graus). Desenhar vira uma consulta mais um blit.
+# Com max_entries, os sprites são gerados sob demanda e os menos usados
+# são descartados (LRU); sem ele, tudo é pré-renderizado na criação, ou
+# recebido pronto em 'sprites' (na ordem de keys(), ex.: lido do disco).
+class RotationCache:
+    def __init__(self, frames, step=1.0, min_angle=-30, max_angle=45, smooth=False,
+                 max_entries=None, sprites=None):
+        self.frames = frames
+        self.step = step
+        self.min_angle = min_angle
+        self.max_angle = max_angle
+        self.max_entries = max_entries
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.set_smooth(smooth, sprites)
+
+    def set_smooth(self, smooth, sprites=None):
+        # Alternar entre rotozoom (suave, mais caro) e rotate (rápido)
+        self.smooth = smooth
+        self.cache.clear()
+        if self.max_entries is None:
+            self.preload(sprites)
+
+    def keys(self):
+        # (frame, passo) de todos os sprites pré-renderizados, em ordem
+        steps = int(round((self.max_angle - self.min_angle) / self.step))
+        return [(frame_index, i) for frame_index in range(len(self.frames))
+                for i in range(steps + 1)]
+
+    def preload(self, sprites=None):
+        keys = self.keys()
+        if sprites is not None and len(sprites) != len(keys):
+            sprites = None  # Lista de outra configuração: renderizar de novo
+        for n, key in enumerate(keys):
+            self.cache[key] = self.render(*key) if sprites is None else sprites[n]
+
+    def sprites(self):
+        # Sprites na ordem de keys(), para guardar e passar de volta em 'sprites'
+        return [self.cache.get(key) or self.render(*key) for key in self.keys()]
+
+    def render(self, frame_index, step_index):
+        angle = self.min_angle + step_index * self.step
+        # Mesmo sentido de antes: ângulo positivo inclina o bico para baixo
+        if self.smooth:
+            return pygame.transform.rotozoom(self.frames[frame_index], -angle, 1)
+        return pygame.transform.rotate(self.frames[frame_index], -angle)
+
+    def get(self, frame_index, angle):
+        angle = max(self.min_angle, min(self.max_angle, angle))
+        key = (frame_index, int(round((angle - self.min_angle) / self.step)))
+        sprite = self.cache.get(key)
+        if sprite is not None:
+            self.hits += 1
+            if self.max_entries is not None:
+                self.cache.move_to_end(key)
+            return sprite
+
+        self.misses += 1
+        sprite = self.render(*key)
+        self.cache[key] = sprite
+        if self.max_entries is not None and len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+        return sprite
+
+
+# --- CACHE DE TEXTOS RENDERIZADOS ---
+# Placar, título e botões repetem o mesmo texto quadro após quadro. Cada
+# superfície renderizada fica guardada pela chave (fonte, texto, cor,
+# antialias); quando o total de memória passa de 'max_bytes', as menos
+# usadas recentemente são descartadas. Os textos de fontes com 'persist'
+# (ver recursos.LazyFont) podem ser exportados e recarregados na próxima
+# execução: com eles, o menu aparece sem nem abrir a fonte.
+class TextCache:
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.cache = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surface = self.cache.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.cache[key] = surface
+        self.bytes += surface.get_width() * surface.get_height() * surface.get_bytesize()
+        while self.bytes > self.max_bytes and len(self.cache) > 1:
+            _, old = self.cache.popitem(last=False)
+            self.bytes -= old.get_width() * old.get_height() * old.get_bytesize()
+        return surface
+
+    def clear(self):
+        self.cache.clear()
+        self.bytes = 0
+
+    def export(self, max_entries=256):
+        # (descrição JSON, superfícies) dos textos mais recentes de fontes
+        # persistentes; a fonte entra pela sua 'key'
+        entries, surfaces = [], []
+        for (font, text, color, antialias), surface in reversed(self.cache.items()):
+            if len(entries) == max_entries:
+                break
+            if getattr(font, 'persist', False):
+                entries.append([list(font.key), text, list(color), antialias])
+                surfaces.append(surface)
+        return entries, surfaces
+
+    def preload(self, fonts, entries, surfaces):
+        # Inverso de export(): 'fonts' são as fontes atuais, casadas pela key
+        by_key = {tuple(font.key): font for font in fonts}
+        for (font_key, text, color, antialias), surface in zip(reversed(entries), reversed(surfaces)):
+            font = by_key.get(tuple(font_key))
+            if font is None:
+                continue
+            self.cache[(font, text, tuple(color), antialias)] = surface
+            self.bytes += surface.get_width() * surface.get_height() * surface.get_bytesize()
@@ -0,0 +1,97 @@
+import numpy as np
+
+# --- ESTIMATIVA DA FREQUÊNCIA FUNDAMENTAL (YIN) ---
+# A autocorrelação vem do mesmo espectro usado no espectrômetro: com a FFT
+# calculada em 2N pontos (janela completada com zeros), a irfft de |X|² é a
+# autocorrelação linear da janela, sem uma segunda FFT direta. A partir
+# dela sai a função diferença do YIN, normalizada pela média acumulada
+# (CMND); o primeiro vale abaixo de 'threshold' dá o período.
+class PitchEstimator:
+    def __init__(self, window_size, sample_rate, f_min=70.0, f_max=1000.0, threshold=0.15):
+        self.window_size = window_size
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        # Faixa de períodos (em amostras) procurada
+        self.tau_min = max(2, int(sample_rate / f_max))
+        self.tau_max = min(window_size // 2, int(np.ceil(sample_rate / f_min)))
+        taus = np.arange(self.tau_max + 1)
+        self.taus = taus.astype(np.float64)
+        # Cada atraso soma (N - tau) termos; a escala compensa para que a
+        # diferença seja uma média por amostra em todos os atrasos
+        self.overlap_scale = window_size / (window_size - self.taus)
+        self.cumsq = np.zeros(window_size + 1)
+        self.diff = np.zeros(self.tau_max + 1)
+        self.cmnd = np.ones(self.tau_max + 1)
+        self.running = np.zeros(self.tau_max)
+        self.pitch_hz = 0.0
+        self.confidence = 0.0
+
+    def estimate(self, power, squares):
+        # power: |X|² da rFFT em 2N pontos; squares: x² da janela (N amostras)
+        n = self.window_size
+        np.cumsum(squares, out=self.cumsq[1:])
+        energy = self.cumsq[n]
+        if energy <= 1e-9:
+            self.pitch_hz = self.confidence = 0.0
+            return self.pitch_hz, self.confidence
+
+        acf = np.fft.irfft(power, n=2 * n)[:self.tau_max + 1]
+
+        # d(tau) = soma de (x[j] - x[j + tau])², com as energias das duas
+        # partes sobrepostas tiradas da soma acumulada dos quadrados
+        d = self.diff
+        np.subtract(self.cumsq[n - self.tau_max:n + 1][::-1], self.cumsq[:self.tau_max + 1], out=d)
+        d += energy
+        d -= 2 * acf
+        d *= self.overlap_scale
+        np.maximum(d, 0, out=d)
+
+        # CMND: d'(tau) = d(tau) * tau / soma(d[1..tau])
+        np.cumsum(d[1:], out=self.running)
+        np.maximum(self.running, 1e-12, out=self.running)
+        np.multiply(d[1:], self.taus[1:], out=self.cmnd[1:])
+        self.cmnd[1:] /= self.running
+
+        cmnd = self.cmnd
+        search = cmnd[self.tau_min:self.tau_max]
+        below = np.flatnonzero(search < self.threshold)
+        if len(below):
+            tau = self.tau_min + int(below[0])
+            # Descer até o fundo do vale
+            while tau + 1 < self.tau_max and cmnd[tau + 1] < cmnd[tau]:
+                tau += 1
+        else:
+            tau = self.tau_min + int(np.argmin(search))
+
+        # Interpolação parabólica em torno do mínimo
+        refined = float(tau)
+        if self.tau_min < tau < self.tau_max - 1:
+            a, b, c = cmnd[tau - 1], cmnd[tau], cmnd[tau + 1]
+            denominator = a - 2 * b + c
+            if denominator > 0:
+                refined += 0.5 * (a - c) / denominator
+
+        self.pitch_hz = self.sample_rate / refined
+        self.confidence = float(min(1.0, max(0.0, 1.0 - cmnd[tau])))
+        return self.pitch_hz, self.confidence
+
+
+# --- MAPEAMENTO DE TOM PARA ALTURA NA TELA ---
+def hz_to_semitones(hz, reference=440.0):
+    # Número MIDI: 69 = lá 440 Hz, um semitom por unidade
+    return 69 + 12 * np.log2(np.asarray(hz) / reference)
+
+
+def pitch_to_height(hz, f_low, f_high, scale="semitons"):
+    # Fração da altura da tela (0 = chão, 1 = teto) para a frequência 'hz'.
+    # "semitons" dá o mesmo espaço a cada intervalo musical; "hz" é linear.
+    # Com um array de frequências (vários jogadores), retorna um array
+    if scale == "semitons":
+        fraction = np.log2(np.asarray(hz) / f_low) / np.log2(f_high / f_low)
+    elif scale == "hz":
+        fraction = (np.asarray(hz) - f_low) / (f_high - f_low)
+    else:
+        raise ValueError(f"Escala de tom desconhecida: {scale}")
+    if np.ndim(fraction) == 0:
+        return min(1.0, max(0.0, float(fraction)))
+    return np.clip(fraction, 0.0, 1.0)